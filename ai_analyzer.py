@@ -1,71 +1,40 @@
 """AI Deep Analyzer for BDO patches using Gemini with Direct URL Analysis"""
+import asyncio
+import functools
 import logging
 import os
-import aiofiles
-from datetime import datetime
-from typing import Dict, Any, Optional
+import re
+import string
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, Tuple
 from config import Config
+from database import BotDatabase
+from report_cache import PatchReportCache
 
 logger = logging.getLogger(__name__)
 
-class BDOAIAnalyzer:
-    """Deep AI analysis of BDO patches using direct URL access"""
-    
-    def __init__(self, api_key: str):
-        self.model = Config.initialize_gemini()
-        self.reports_folder = "patch_reports"
-        os.makedirs(self.reports_folder, exist_ok=True)
-        
-        # Use config limits
-        self.max_content_length = Config.MAX_TRANSLATION_LENGTH
-        self.max_analysis_length = Config.MAX_SUMMARY_LENGTH
-    
-    async def generate_deep_report(self, patch_data: Dict[str, Any]) -> Optional[str]:
-        """Generate comprehensive analysis report by passing URL directly to AI"""
-        try:
-            # Create comprehensive analysis prompt with URL
-            analysis_prompt = self._create_url_analysis_prompt(patch_data)
-            
-            # Safe logging for Korean titles
-            from utils.helpers import safe_log_message
-            safe_title = safe_log_message(patch_data['title'][:50])
-            logger.info(f"Generating deep analysis via direct URL for {patch_data['source']}: {safe_title}...")
-            
-            # Pass URL directly to Gemini for analysis
-            response = self.model.generate_content(analysis_prompt)
-            
-            if response and response.text:
-                # Create formatted report
-                report = self._format_final_report(patch_data, response.text)
-                
-                # Save to file
-                filename = await self._save_report_to_file(patch_data, report)
-                
-                logger.info(f"Generated and saved deep analysis report: {filename}")
-                return filename
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error generating deep report: {e}")
-            return None
-    
-    def _create_url_analysis_prompt(self, patch_data: Dict[str, Any]) -> str:
-        """Create comprehensive analysis prompt that includes the URL for direct access"""
-        
-        # Check if this is a maintenance update
-        maintenance_keywords = ['maintenance', 'server maintenance', 'scheduled maintenance', 
-                              'hotfix', '정기점검', '임시점검', '서버점검']
-        is_maintenance = any(keyword in patch_data['title'].lower() for keyword in maintenance_keywords)
-        
-        if is_maintenance:
-            prompt = f"""
-Please access and analyze the content from this URL: {patch_data['link']}
+_UTC = timezone.utc
+
+_SOURCE_TRANS = str.maketrans({' ': '_'})
+
+@functools.lru_cache(maxsize=32)
+def _clean_source(source: str) -> str:
+    """Filename-safe form of a source name, e.g. 'Global Labs' -> 'global_lab'"""
+    return source.lower().translate(_SOURCE_TRANS).replace('labs', 'lab')
+
+def _sync_write(path: str, data: str) -> int:
+    """Write a report in one call and return the number of bytes written"""
+    with open(path, 'wb') as f:
+        return f.write(data.encode('utf-8'))
+
+# Analysis prompt templates; the static body is built once at import time
+_MAINTENANCE_TMPL = string.Template("""
+Please access and analyze the content from this URL: $link
 
 PATCH INFORMATION:
-- Title: {patch_data['title']}
-- Date: {patch_data['date']}
-- Source: {patch_data['source']}
+- Title: $title
+- Date: $date
+- Source: $source
 
 This appears to be a maintenance update. Please access the URL and provide a brief summary focusing on:
 - Server downtime details
@@ -73,19 +42,19 @@ This appears to be a maintenance update. Please access the URL and provide a bri
 - Impact on players
 
 Keep the analysis concise for maintenance updates.
-"""
-        else:
-            prompt = f"""
-Please access and analyze the Black Desert Online patch content from this URL: {patch_data['link']}
+""")
+
+_FULL_TMPL = string.Template(string.Template("""
+Please access and analyze the Black Desert Online patch content from this URL: $link
 
 PATCH INFORMATION:
-- Title: {patch_data['title']}
-- Date: {patch_data['date']}
-- Source: {patch_data['source']}
+- Title: $title
+- Date: $date
+- Source: $source
 
 You are a senior Black Desert Online intelligence analyst. After accessing the URL, create an extremely detailed, comprehensive analysis report.
 
-REQUIRED DETAILED ANALYSIS SECTIONS (Target: {Config.MAX_SUMMARY_LENGTH} characters total):
+REQUIRED DETAILED ANALYSIS SECTIONS (Target: $max_len characters total):
 
 1. **EXECUTIVE SUMMARY** (4-5 paragraphs)
    - Overall significance and strategic implications
@@ -150,14 +119,93 @@ REQUIRED DETAILED ANALYSIS SECTIONS (Target: {Config.MAX_SUMMARY_LENGTH} charact
 For each section, provide specific details, exact numbers where available, and strategic insights. Use bullet points and clear formatting. If any section does not exist in the patch, state that clearly.
 
 Access the URL directly and analyze ALL content thoroughly. Generate a comprehensive intelligence report with maximum detail suitable for competitive players and guilds.
-"""
+""").safe_substitute(max_len=Config.MAX_SUMMARY_LENGTH))
+
+# Maintenance titles; 'maintenance' also covers "server/scheduled maintenance"
+_MAINT_RE = re.compile(r'maintenance|hotfix|정기점검|임시점검|서버점검', re.IGNORECASE)
+
+class BDOAIAnalyzer:
+    """Deep AI analysis of BDO patches using direct URL access"""
+    
+    def __init__(self, api_key: str, db: Optional[BotDatabase] = None):
+        self.model = Config.initialize_gemini()
+        self.reports_folder = "patch_reports"
+        self._reports_folder_ready = False  # Created lazily on first save
         
-        return prompt
+        # Use config limits
+        self.max_content_length = Config.MAX_TRANSLATION_LENGTH
+        self.max_analysis_length = Config.MAX_SUMMARY_LENGTH
+        
+        # Reuse analyses for identical prompts instead of calling Gemini again
+        self.cache = PatchReportCache(Config.REPORT_CACHE_MAX_ENTRIES, db)
+        
+        # Latest report per source: source_clean -> (YYYYMMDDHHMM, filepath)
+        self._latest_by_source: Dict[str, Optional[Tuple[str, str]]] = {}
+        
+        # Bumped on every saved report so listings of the folder know when they are stale
+        self.reports_generation = 0
     
-    def _format_final_report(self, patch_data: Dict[str, Any], ai_analysis: str) -> str:
-        """Format the final report with metadata"""
+    async def generate_deep_report(self, patch_data: Dict[str, Any], use_cache: bool = True) -> Optional[str]:
+        """Generate comprehensive analysis report by passing URL directly to AI"""
+        try:
+            # Create comprehensive analysis prompt with URL
+            analysis_prompt = self._create_url_analysis_prompt(patch_data)
+            cache_key = self.cache.make_key(analysis_prompt)
+            
+            # Safe logging for Korean titles
+            from utils.helpers import safe_log_message
+            safe_title = safe_log_message(patch_data['title'][:50])
+            
+            ai_analysis = await self.cache.get(cache_key) if use_cache else None
+            now = datetime.now(_UTC)  # Shared by the header and the filename
+            
+            if ai_analysis is not None:
+                logger.info(f"Reusing cached analysis for {patch_data['source']}: {safe_title}...")
+                
+                # Create formatted report and save to file
+                report = self._format_final_report(patch_data, ai_analysis, now)
+                filename = await self._save_report_to_file(patch_data, report, now)
+            else:
+                logger.info(f"Generating deep analysis via direct URL for {patch_data['source']}: {safe_title}...")
+                
+                # Pass URL directly to Gemini and stream the analysis into the report file
+                filename, ai_analysis = await self._stream_report_to_file(patch_data, analysis_prompt, now)
+                
+                if not ai_analysis:
+                    return None
+                
+                await self.cache.put(cache_key, ai_analysis)
+            
+            if filename:
+                logger.info(f"Generated and saved deep analysis report: {filename}")
+            return filename
+            
+        except Exception as e:
+            logger.error(f"Error generating deep report: {e}")
+            return None
+    
+    def _create_url_analysis_prompt(self, patch_data: Dict[str, Any]) -> str:
+        """Create comprehensive analysis prompt that includes the URL for direct access"""
         
-        header = f"""BLACK DESERT ONLINE - INTELLIGENCE REPORT
+        # Check if this is a maintenance update
+        is_maintenance = bool(_MAINT_RE.search(patch_data['title']))
+        
+        template = _MAINTENANCE_TMPL if is_maintenance else _FULL_TMPL
+        return template.substitute(
+            link=patch_data['link'],
+            title=patch_data['title'],
+            date=patch_data['date'],
+            source=patch_data['source']
+        )
+    
+    def _format_final_report(self, patch_data: Dict[str, Any], ai_analysis: str, now: datetime) -> str:
+        """Format the final report with metadata"""
+        return (self._format_report_header(patch_data, now) + ai_analysis +
+                self._format_report_footer(len(ai_analysis)))
+    
+    def _format_report_header(self, patch_data: Dict[str, Any], now: datetime) -> str:
+        """Format the report metadata header"""
+        return f"""BLACK DESERT ONLINE - INTELLIGENCE REPORT
 {'='*60}
 
 PATCH INFORMATION:
@@ -165,49 +213,56 @@ PATCH INFORMATION:
 - Date: {patch_data['date']}
 - Source: {patch_data['source']}
 - Original URL: {patch_data['link']}
-- Analysis Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
+- Analysis Generated: {now.strftime('%Y-%m-%d %H:%M:%S UTC')}
 - Report ID: {patch_data['id']}
 - AI Model: {Config.GEMINI_MODEL}
 - Analysis Method: Direct URL Access
-- Analysis Length: {len(ai_analysis)} characters
 
 {'='*60}
 
 """
-        
-        footer = f"""
+    
+    def _format_report_footer(self, analysis_length: int) -> str:
+        """Format the report footer; written last so it can carry the analysis length"""
+        return f"""
 
 {'='*60}
 Report Generated by BDO Intelligence Division
 AI Analysis Model: {Config.GEMINI_MODEL}
 Classification: Comprehensive Analysis
+Analysis Length: {analysis_length} characters
 Max Content Length: {Config.MAX_TRANSLATION_LENGTH}
 Max Analysis Length: {Config.MAX_SUMMARY_LENGTH}
 Analysis Method: Direct URL Processing
 Distribution: Community & Competitive Players
 {'='*60}
 """
+    
+    def _build_report_path(self, patch_data: Dict[str, Any], now: datetime) -> Tuple[str, str, str, str]:
+        """Return (source_clean, date_str, filename, filepath) for a new report"""
+        if not self._reports_folder_ready:
+            os.makedirs(self.reports_folder, exist_ok=True)
+            self._reports_folder_ready = True
         
-        return header + ai_analysis + footer
+        # Generate filename with more descriptive naming
+        source_clean = _clean_source(patch_data['source'])
+        date_str = now.strftime('%Y%m%d_%H%M')
+        
+        # Include model name in filename for tracking
+        model_clean = Config.GEMINI_MODEL.replace('-', '_').replace('.', '_')
+        filename = f"{source_clean}_{patch_data['id']}_{model_clean}_url_{date_str}.txt"
+        return source_clean, date_str, filename, os.path.join(self.reports_folder, filename)
     
-    async def _save_report_to_file(self, patch_data: Dict[str, Any], report: str) -> str:
+    async def _save_report_to_file(self, patch_data: Dict[str, Any], report: str, now: datetime) -> str:
         """Save report to .txt file with enhanced metadata"""
         try:
-            # Generate filename with more descriptive naming
-            source_clean = patch_data['source'].lower().replace(' ', '_').replace('labs', 'lab')
-            date_str = datetime.now().strftime('%Y%m%d_%H%M')
-            
-            # Include model name in filename for tracking
-            model_clean = Config.GEMINI_MODEL.replace('-', '_').replace('.', '_')
-            filename = f"{source_clean}_{patch_data['id']}_{model_clean}_url_{date_str}.txt"
-            filepath = os.path.join(self.reports_folder, filename)
+            source_clean, date_str, filename, filepath = self._build_report_path(patch_data, now)
             
             # Save file with UTF-8 encoding
-            async with aiofiles.open(filepath, 'w', encoding='utf-8') as f:
-                await f.write(report)
+            file_size = await asyncio.to_thread(_sync_write, filepath, report)
+            self._record_latest(source_clean, date_str, filepath)
             
             # Log file creation with size info
-            file_size = len(report.encode('utf-8'))
             logger.info(f"Saved report: {filename} ({file_size:,} bytes)")
             
             return filename
@@ -216,27 +271,83 @@ Distribution: Community & Competitive Players
             logger.error(f"Error saving report to file: {e}")
             return None
     
+    async def _stream_report_to_file(self, patch_data: Dict[str, Any], prompt: str,
+                                    now: datetime) -> Tuple[Optional[str], Optional[str]]:
+        """Stream the Gemini analysis into the report file as chunks arrive.
+        
+        Returns (filename, analysis); both are None when Gemini returned no text.
+        """
+        source_clean, date_str, filename, filepath = self._build_report_path(patch_data, now)
+        header = self._format_report_header(patch_data, now)
+        
+        def _stream() -> str:
+            parts = []
+            try:
+                response = self.model.generate_content(prompt, stream=True)
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    f.write(header)
+                    for chunk in response:
+                        parts.append(chunk.text)
+                        f.write(parts[-1])
+                    analysis = ''.join(parts)
+                    f.write(self._format_report_footer(len(analysis)))
+            except BaseException:
+                if os.path.exists(filepath):
+                    os.remove(filepath)
+                raise
+            
+            if not analysis:
+                os.remove(filepath)
+            return analysis
+        
+        ai_analysis = await asyncio.to_thread(_stream)
+        if not ai_analysis:
+            return None, None
+        
+        self._record_latest(source_clean, date_str, filepath)
+        logger.info(f"Saved report: {filename} ({len(ai_analysis):,} characters of analysis)")
+        
+        return filename, ai_analysis
+    
     def get_latest_report_file(self, source: str) -> Optional[str]:
         """Get the latest report file for a source"""
+        source_clean = _clean_source(source)
+        
+        if source_clean not in self._latest_by_source:
+            self._latest_by_source[source_clean] = self._scan_latest_report(source_clean)
+        
+        latest = self._latest_by_source[source_clean]
+        return latest[1] if latest else None
+    
+    def _record_latest(self, source_clean: str, date_str: str, filepath: str):
+        """Remember a freshly saved report as the latest for its source"""
+        self._latest_by_source[source_clean] = (date_str.replace('_', ''), filepath)
+        self.reports_generation += 1
+    
+    def _scan_latest_report(self, source_clean: str) -> Optional[Tuple[str, str]]:
+        """Find the newest report for a source from the timestamp in its filename"""
+        latest = None
         try:
-            source_clean = source.lower().replace(' ', '_').replace('labs', 'lab')
-            
-            # Find files matching the source
-            matching_files = []
-            for filename in os.listdir(self.reports_folder):
-                if filename.startswith(source_clean) and filename.endswith('.txt'):
-                    filepath = os.path.join(self.reports_folder, filename)
-                    matching_files.append((filepath, os.path.getctime(filepath)))
-            
-            if matching_files:
-                # Sort by creation time, return most recent
-                latest_file = max(matching_files, key=lambda x: x[1])
-                return latest_file[0]
-                
+            with os.scandir(self.reports_folder) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not (name.startswith(source_clean) and name.endswith('.txt')):
+                        continue
+                    
+                    # Filenames end in ..._YYYYMMDD_HHMM.txt
+                    parts = name[:-4].rsplit('_', 2)
+                    if len(parts) != 3:
+                        continue
+                    stamp = parts[1] + parts[2]
+                    if stamp.isdigit() and (latest is None or stamp > latest[0]):
+                        latest = (stamp, entry.path)
+                        
+        except FileNotFoundError:
+            pass  # No reports saved yet
         except Exception as e:
             logger.error(f"Error getting latest report file: {e}")
         
-        return None
+        return latest
     
     def get_model_info(self) -> Dict[str, Any]:
         """Get current model configuration info"""
@@ -2,6 +2,7 @@
 import discord
 from discord.ext import commands
 import logging
+from config import Config
 
 logger = logging.getLogger(__name__)
 
@@ -13,14 +14,10 @@ class ConfigCommands(commands.Cog):
         self.db = bot.db
     
     @commands.command(name='usepatch')
+    @commands.has_guild_permissions(manage_channels=True)  # Administrators pass implicitly
     async def set_patch_channel(self, ctx):
         """Set the current channel for patch notifications"""
         try:
-            # Check if user has manage channels permission OR is admin
-            if not (ctx.author.guild_permissions.manage_channels or ctx.author.guild_permissions.administrator):
-                await ctx.send("❌ You need 'Manage Channels' or 'Administrator' permission to use this command.")
-                return
-            
             success = self.db.set_patch_channel(ctx.guild.id, ctx.channel.id)
             
             if success:
@@ -45,12 +42,21 @@ class ConfigCommands(commands.Cog):
             logger.error(f"Error in usepatch command: {e}")
             await ctx.send("❌ An error occurred. Please try again.")
     
+    @set_patch_channel.error
+    async def set_patch_channel_error(self, ctx, error):
+        """Handle usepatch permission failures"""
+        if isinstance(error, commands.MissingPermissions):
+            await ctx.send("❌ You need 'Manage Channels' or 'Administrator' permission to use this command.")
+        elif isinstance(error, commands.NoPrivateMessage):
+            await ctx.send("❌ This command can only be used in a server.")
+        else:
+            logger.error(f"Error in usepatch command: {error}")
+            await ctx.send("❌ An error occurred. Please try again.")
+    
     # @commands.command(name='bdolan')
     # async def set_language(self, ctx, language_code: str = 'en'):
     #     """Set translation language"""
     #     try:
-    #         from config import Config
-            
     #         if language_code not in Config.SUPPORTED_LANGUAGES:
     #             embed = discord.Embed(
     #                 title="❌ Invalid Language",
@@ -107,7 +113,6 @@ class ConfigCommands(commands.Cog):
                 channel = ctx.guild.get_channel(config['channel_id'])
                 channel_name = channel.mention if channel else "Channel not found"
                 
-                from config import Config
                 language_name = Config.SUPPORTED_LANGUAGES.get(config['language'], 'English')
                 
                 embed.add_field(
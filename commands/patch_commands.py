@@ -1,13 +1,123 @@
 """Enhanced patch commands with history access"""
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 import discord
 from discord.ext import commands
+import asyncio
+import io
 import logging
 import os
-import math
+import time
+from collections import OrderedDict
+from config import Config
+from utils.helpers import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Reports only change once per check cycle, so cached reads stay fresh for that long
+_REPORT_CACHE_TTL = Config.CHECK_INTERVAL_MINUTES * 60
+_MISSING = object()
+_REPORTS_LISTING_TTL = 300
+_REPORT_BYTES_BUDGET = 32 * 1024 * 1024  # Upper bound on cached report file contents
+
+_SOURCE_ALIASES = {
+    'gl': 'Global Labs',
+    'globallab': 'Global Labs',
+    'global': 'Global Labs',
+    'ko': 'Korean Notice',
+    'korean': 'Korean Notice',
+    'kr': 'Korean Notice'
+}
+_SOURCE_SHORT = {'Global Labs': 'gl', 'Korean Notice': 'ko'}
+
+def _resolve_source(source: Optional[str]) -> Optional[str]:
+    """Map a user-supplied source alias to its source name"""
+    return _SOURCE_ALIASES.get(source.lower()) if source else None
+
+# Static embed text, precomputed per source short code where it varies
+_CONTAINS_BLOCK = (
+    "• Executive Summary & Strategic Analysis\n"
+    "• Detailed Content & Balance Changes\n"
+    "• Competitive Intelligence & Meta Impact\n"
+    "• Player Action Items & Recommendations"
+)
+_NAVIGATION = {
+    short: f"`!history {short}` - Show all reports\n`!latest {short}` - Get latest report"
+    for short in _SOURCE_SHORT.values()
+}
+_USAGE_EXAMPLES = {
+    short: (
+        f"`!history {short} 1` - Get latest report\n"
+        f"`!history {short} 3` - Get 3rd latest report\n"
+        f"`!latest {short}` - Get latest with file\n"
+        f"`!archive {short}` - Browse all reports"
+    )
+    for short in _SOURCE_SHORT.values()
+}
+
+_CONTAINS_FIELD = {"name": "🎯 Contains", "value": _CONTAINS_BLOCK, "inline": False}
+
+_ARCHIVE_HELP = "📚 **Archive Help**\n`!archive gl` - Global Labs archive\n`!archive ko` - Korean archive"
+
+def _build_report_embed(report_info: Dict[str, Any], source: str, title: str, position_text: str,
+                        file_size: int, extra_field: Optional[Dict[str, Any]], footer: str) -> discord.Embed:
+    """Build a report embed from one payload dict instead of field-by-field calls"""
+    fields = [
+        {
+            "name": "📋 Report Details",
+            "value": (
+                f"**Date:** {report_info['date']}\n"
+                f"**Generated:** {report_info['generated_at'][:16]}\n"
+                f"**Position:** {position_text}"
+            ),
+            "inline": False
+        },
+        _CONTAINS_FIELD,
+        {
+            "name": "📄 File Info",
+            "value": f"**Size:** {file_size:,} bytes\n**Format:** Plain Text (.txt)",
+            "inline": True
+        }
+    ]
+    if extra_field:
+        fields.append(extra_field)
+    
+    return discord.Embed.from_dict({
+        "title": title,
+        "description": f"**{report_info['title'][:100]}...**",
+        "color": 0x00ff88 if 'Global' in source else 0xff6b35,
+        "fields": fields,
+        "footer": {"text": footer}
+    })
+
+async def _add_reactions(message: discord.Message, *emojis: str):
+    """Add reactions concurrently; failures are ignored like before"""
+    await asyncio.gather(*(message.add_reaction(emoji) for emoji in emojis), return_exceptions=True)
+
+def _report_mtime(path: str) -> Optional[int]:
+    """Modification time of a report in nanoseconds, or None if it does not exist"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def _read_report_file(path: str) -> Optional[bytes]:
+    """Read a report file in one go, or return None if it does not exist"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def _list_report_files(folder: str) -> Optional[List[Tuple[str, float]]]:
+    """Return (filename, ctime) for every report, newest first, or None without a folder"""
+    try:
+        names = [f for f in os.listdir(folder) if f.endswith('.txt')]
+    except FileNotFoundError:
+        return None
+    files_with_time = [(f, os.path.getctime(os.path.join(folder, f))) for f in names]
+    files_with_time.sort(key=lambda x: x[1], reverse=True)
+    return files_with_time
+
 class PatchCommands(commands.Cog):
     """Enhanced patch commands with history access"""
     
@@ -15,20 +125,114 @@ class PatchCommands(commands.Cog):
         self.bot = bot
         self.db = bot.db
         self.ai_analyzer = bot.ai_analyzer
+        
+        # Read-through caches for the report lookups behind !latest/!history/!archive
+        self._latest_cache = TTLCache(maxsize=8, ttl=_REPORT_CACHE_TTL)
+        self._count_cache = TTLCache(maxsize=8, ttl=_REPORT_CACHE_TTL)
+        self._by_index_cache = TTLCache(maxsize=256, ttl=_REPORT_CACHE_TTL)
+        self._digests_cache = TTLCache(maxsize=16, ttl=_REPORT_CACHE_TTL)
+        
+        # (analyzer generation, monotonic timestamp, listing) for !reports
+        self._reports_listing_cache: Optional[Tuple[int, float, List[Tuple[str, float]]]] = None
+        
+        # Report file contents keyed on (path, mtime), bounded by _REPORT_BYTES_BUDGET
+        self._report_bytes: "OrderedDict[Tuple[str, int], bytes]" = OrderedDict()
+        self._report_bytes_total = 0
+        
+        # Static help embeds are built once and copied per invocation
+        self._help_embed = self._build_help_embed()
+        self._help_followup_embed = self._build_help_followup_embed()
+        self._history_help_embed = self._build_history_help_embed()
+    
+    def invalidate(self, source: str):
+        """Forget cached report lookups for a source after a report is stored"""
+        self._latest_cache.discard_where(lambda key: key == source)
+        self._count_cache.discard_where(lambda key: key == source)
+        self._by_index_cache.discard_where(lambda key: key[0] == source)
+        self._digests_cache.discard_where(lambda key: key[0] == source)
+    
+    async def _cached_report_listing(self) -> Optional[List[Tuple[str, float]]]:
+        """Report files newest first, reused until a report is saved or the TTL passes"""
+        generation = self.ai_analyzer.reports_generation
+        cached = self._reports_listing_cache
+        if cached and cached[0] == generation and time.monotonic() - cached[1] < _REPORTS_LISTING_TTL:
+            return cached[2]
+        
+        listing = await asyncio.to_thread(_list_report_files, self.ai_analyzer.reports_folder)
+        if listing is not None:
+            self._reports_listing_cache = (generation, time.monotonic(), listing)
+        return listing
+    
+    async def _load_report_bytes(self, path: str) -> Optional[bytes]:
+        """Report file contents, reread only when the file's mtime changes"""
+        mtime = await asyncio.to_thread(_report_mtime, path)
+        if mtime is None:
+            return None
+        
+        key = (path, mtime)
+        data = self._report_bytes.get(key)
+        if data is not None:
+            self._report_bytes.move_to_end(key)
+            return data
+        
+        data = await asyncio.to_thread(_read_report_file, path)
+        if data is None:
+            return None
+        
+        self._report_bytes[key] = data
+        self._report_bytes_total += len(data)
+        while self._report_bytes_total > _REPORT_BYTES_BUDGET and len(self._report_bytes) > 1:
+            _, evicted = self._report_bytes.popitem(last=False)
+            self._report_bytes_total -= len(evicted)
+        return data
+    
+    async def _cached_latest(self, source: str):
+        """(latest report, total) for a source, served from cache when fresh"""
+        cached = self._latest_cache.get(source)
+        if cached is None:
+            cached = await asyncio.to_thread(self.db.get_latest_report_with_count, source)
+            self._latest_cache.set(source, cached)
+        return cached
+    
+    async def _cached_count(self, source: str) -> int:
+        """Report count for a source, served from cache when fresh"""
+        total = self._count_cache.get(source, _MISSING)
+        if total is _MISSING:
+            total = await asyncio.to_thread(self.db.count_reports, source)
+            self._count_cache.set(source, total)
+        return total
+    
+    async def _cached_by_index(self, source: str, index: int):
+        """(report, total) for a history index, served from cache when fresh"""
+        cached = self._by_index_cache.get((source, index))
+        if cached is None:
+            cached = await asyncio.to_thread(self.db.get_report_by_index_with_total, source, index)
+            self._by_index_cache.set((source, index), cached)
+        return cached
+    
+    async def _cached_digests(self, source: str, limit: int, title_len: int):
+        """(index, date, short title) rows for a listing, served from cache when fresh"""
+        key = (source, limit, title_len)
+        digests = self._digests_cache.get(key)
+        if digests is None:
+            digests = await asyncio.to_thread(self.db.get_report_digests, source, limit, title_len)
+            self._digests_cache.set(key, digests)
+        return digests
     
     @commands.command(name='latest')
     async def latest_command(self, ctx, source: str = 'both'):
         """Send latest AI analysis reports"""
         
-        if source.lower() in ['gl', 'globallab', 'global']:
-            await self._send_latest_report(ctx, 'Global Labs')
-        elif source.lower() in ['ko', 'korean', 'kr']:
-            await self._send_latest_report(ctx, 'Korean Notice')
+        source_name = _resolve_source(source)
+        if source_name:
+            await self._send_latest_report(ctx, source_name)
         else:
             # Send both
             await ctx.send("📊 **Fetching latest AI analysis reports...**")
-            await self._send_latest_report(ctx, 'Global Labs')
-            await self._send_latest_report(ctx, 'Korean Notice')
+            await asyncio.gather(
+                self._send_latest_report(ctx, 'Global Labs'),
+                self._send_latest_report(ctx, 'Korean Notice')
+            )
     
     @commands.command(name='history')
     async def history_command(self, ctx, source: str = None, index: int = None):
@@ -39,11 +243,8 @@ class PatchCommands(commands.Cog):
             return
         
         # Determine source
-        if source.lower() in ['gl', 'globallab', 'global']:
-            source_name = 'Global Labs'
-        elif source.lower() in ['ko', 'korean', 'kr']:
-            source_name = 'Korean Notice'
-        else:
+        source_name = _resolve_source(source)
+        if source_name is None:
             await ctx.send("❌ Invalid source. Use `gl` for Global Labs or `ko` for Korean notices.")
             return
         
@@ -65,15 +266,12 @@ class PatchCommands(commands.Cog):
         """Show paginated archive of all reports"""
         
         if not source:
-            await ctx.send("📚 **Archive Help**\n`!archive gl` - Global Labs archive\n`!archive ko` - Korean archive")
+            await ctx.send(_ARCHIVE_HELP)
             return
         
         # Determine source
-        if source.lower() in ['gl', 'globallab', 'global']:
-            source_name = 'Global Labs'
-        elif source.lower() in ['ko', 'korean', 'kr']:
-            source_name = 'Korean Notice'
-        else:
+        source_name = _resolve_source(source)
+        if source_name is None:
             await ctx.send("❌ Invalid source. Use `gl` or `ko`.")
             return
         
@@ -82,8 +280,8 @@ class PatchCommands(commands.Cog):
     async def _send_latest_report(self, ctx, source: str):
         """Send the latest AI report file for a source - ENHANCED"""
         try:
-            # Get latest report from database
-            report_info = self.db.get_latest_report(source)
+            # Get latest report and total reports count from database
+            report_info, total_reports = await self._cached_latest(source)
             
             if not report_info:
                 await ctx.send(f"❌ No AI analysis reports found for {source}")
@@ -93,70 +291,37 @@ class PatchCommands(commands.Cog):
             report_filename = report_info['report_filename']
             report_path = os.path.join(self.ai_analyzer.reports_folder, report_filename)
             
-            if not os.path.exists(report_path):
+            report_bytes = await self._load_report_bytes(report_path)
+            if report_bytes is None:
                 await ctx.send(f"❌ Report file not found: {report_filename}")
                 return
             
-            # Check total reports count
-            total_reports = self.db.count_reports(source)
-            
-            # Create embed
-            embed = discord.Embed(
+            # Create embed; the history pointer only makes sense with older reports
+            history_field = None
+            if total_reports > 1:
+                source_short = _SOURCE_SHORT[source]
+                history_field = {
+                    "name": "📚 Access History",
+                    "value": f"Use `!history {source_short}` to see all {total_reports} reports\nOr `!history {source_short} 2` for 2nd latest",
+                    "inline": True
+                }
+            
+            embed = _build_report_embed(
+                report_info, source,
                 title=f"📊 {source} - Latest AI Analysis Report",
-                description=f"**{report_info['title'][:100]}...**",
-                color=0x00ff88 if 'Global' in source else 0xff6b35,
-                timestamp=ctx.message.created_at
-            )
-            
-            embed.add_field(
-                name="📋 Report Details",
-                value=(
-                    f"**Date:** {report_info['date']}\n"
-                    f"**Generated:** {report_info['generated_at'][:16]}\n"
-                    f"**Position:** #1 of {total_reports} total reports"
-                ),
-                inline=False
+                position_text=f"#1 of {total_reports} total reports",
+                file_size=len(report_bytes),
+                extra_field=history_field,
+                footer="AI-Generated Intelligence Report • BDO Patch Bot"
             )
-            
-            embed.add_field(
-                name="🎯 Contains",
-                value=(
-                    "• Executive Summary & Strategic Analysis\n"
-                    "• Detailed Content & Balance Changes\n"
-                    "• Competitive Intelligence & Meta Impact\n"
-                    "• Player Action Items & Recommendations"
-                ),
-                inline=False
-            )
-            
-            # Get file size
-            file_size = os.path.getsize(report_path)
-            embed.add_field(
-                name="📄 File Info",
-                value=f"**Size:** {file_size:,} bytes\n**Format:** Plain Text (.txt)",
-                inline=True
-            )
-            
-            if total_reports > 1:
-                source_short = 'gl' if 'Global' in source else 'ko'
-                embed.add_field(
-                    name="📚 Access History",
-                    value=f"Use `!history {source_short}` to see all {total_reports} reports\nOr `!history {source_short} 2` for 2nd latest",
-                    inline=True
-                )
-            
-            embed.set_footer(text="AI-Generated Intelligence Report • BDO Patch Bot")
+            embed.timestamp = ctx.message.created_at
             
             # Send file with embed
-            with open(report_path, 'rb') as f:
-                discord_file = discord.File(f, filename=report_filename)
-                message = await ctx.send(embed=embed, file=discord_file)
+            discord_file = discord.File(io.BytesIO(report_bytes), filename=report_filename)
+            message = await ctx.send(embed=embed, file=discord_file)
             
-            # Add reactions
-            await message.add_reaction("📊")
-            await message.add_reaction("⭐")
-            if total_reports > 1:
-                await message.add_reaction("📚")  # Archive indicator
+            # Add reactions (📚 marks that older reports exist)
+            await _add_reactions(message, "📊", "⭐", *(("📚",) if total_reports > 1 else ()))
             
             logger.info(f"Sent latest AI report for {source} to {ctx.guild.name}")
             
@@ -167,16 +332,13 @@ class PatchCommands(commands.Cog):
     async def _send_report_by_index(self, ctx, source: str, index: int):
         """Send a specific report by its index"""
         try:
-            # Get total count first
-            total_reports = self.db.count_reports(source)
+            # Get specific report and the total count in one query
+            report_info, total_reports = await self._cached_by_index(source, index)
             
             if index > total_reports:
                 await ctx.send(f"❌ Only {total_reports} reports available for {source}. Use index 1-{total_reports}")
                 return
             
-            # Get specific report
-            report_info = self.db.get_report_by_index(source, index)
-            
             if not report_info:
                 await ctx.send(f"❌ Report #{index} not found for {source}")
                 return
@@ -185,66 +347,30 @@ class PatchCommands(commands.Cog):
             report_filename = report_info['report_filename']
             report_path = os.path.join(self.ai_analyzer.reports_folder, report_filename)
             
-            if not os.path.exists(report_path):
+            report_bytes = await self._load_report_bytes(report_path)
+            if report_bytes is None:
                 await ctx.send(f"❌ Report file not found: {report_filename}")
                 return
             
             # Create embed
             position_text = "Latest" if index == 1 else f"#{index} of {total_reports}"
             
-            embed = discord.Embed(
+            embed = _build_report_embed(
+                report_info, source,
                 title=f"📊 {source} - Historical Report ({position_text})",
-                description=f"**{report_info['title'][:100]}...**",
-                color=0x00ff88 if 'Global' in source else 0xff6b35,
-                timestamp=ctx.message.created_at
-            )
-            
-            embed.add_field(
-                name="📋 Report Details",
-                value=(
-                    f"**Date:** {report_info['date']}\n"
-                    f"**Generated:** {report_info['generated_at'][:16]}\n"
-                    f"**Position:** {position_text}"
-                ),
-                inline=False
-            )
-            
-            embed.add_field(
-                name="🎯 Contains",
-                value=(
-                    "• Executive Summary & Strategic Analysis\n"
-                    "• Detailed Content & Balance Changes\n"
-                    "• Competitive Intelligence & Meta Impact\n"
-                    "• Player Action Items & Recommendations"
-                ),
-                inline=False
+                position_text=position_text,
+                file_size=len(report_bytes),
+                extra_field={"name": "🔄 Navigation", "value": _NAVIGATION[_SOURCE_SHORT[source]], "inline": True},
+                footer=f"Historical Report #{index} • BDO Patch Bot"
             )
-            
-            # Get file size
-            file_size = os.path.getsize(report_path)
-            embed.add_field(
-                name="📄 File Info",
-                value=f"**Size:** {file_size:,} bytes\n**Format:** Plain Text (.txt)",
-                inline=True
-            )
-            
-            source_short = 'gl' if 'Global' in source else 'ko'
-            embed.add_field(
-                name="🔄 Navigation",
-                value=f"`!history {source_short}` - Show all reports\n`!latest {source_short}` - Get latest report",
-                inline=True
-            )
-            
-            embed.set_footer(text=f"Historical Report #{index} • BDO Patch Bot")
+            embed.timestamp = ctx.message.created_at
             
             # Send file with embed
-            with open(report_path, 'rb') as f:
-                discord_file = discord.File(f, filename=report_filename)
-                message = await ctx.send(embed=embed, file=discord_file)
+            discord_file = discord.File(io.BytesIO(report_bytes), filename=report_filename)
+            message = await ctx.send(embed=embed, file=discord_file)
             
             # Add reactions
-            await message.add_reaction("📊")
-            await message.add_reaction("📚")
+            await _add_reactions(message, "📊", "📚")
             
             logger.info(f"Sent historical report #{index} for {source} to {ctx.guild.name}")
             
@@ -255,8 +381,8 @@ class PatchCommands(commands.Cog):
     async def _show_available_reports(self, ctx, source: str):
         """Show list of available reports for a source"""
         try:
-            reports = self.db.get_all_reports(source, 10)  # Get last 10
-            total_count = self.db.count_reports(source)
+            reports = await self._cached_digests(source, 10, 60)  # Get last 10
+            total_count = await self._cached_count(source)
             
             if not reports:
                 await ctx.send(f"❌ No reports found for {source}")
@@ -267,28 +393,17 @@ class PatchCommands(commands.Cog):
                 color=0x00ff88 if 'Global' in source else 0xff6b35
             )
             
-            # Add recent reports
-            report_list = []
-            for i, report in enumerate(reports[:10], 1):
-                date_short = report['generated_at'][:10]  # YYYY-MM-DD
-                title_short = report['title'][:60] + "..." if len(report['title']) > 60 else report['title']
-                report_list.append(f"`#{i}` **{date_short}** - {title_short}")
-            
+            # Add recent reports (dates are YYYY-MM-DD, titles already shortened)
             embed.add_field(
                 name=f"📋 Recent Reports (Showing {len(reports)} of {total_count})",
-                value="\n".join(report_list),
+                value="\n".join(f"`#{i}` **{date_short}** - {title_short}" for i, date_short, title_short in reports),
                 inline=False
             )
             
-            source_short = 'gl' if 'Global' in source else 'ko'
+            source_short = _SOURCE_SHORT[source]
             embed.add_field(
                 name="📖 Usage Examples",
-                value=(
-                    f"`!history {source_short} 1` - Get latest report\n"
-                    f"`!history {source_short} 3` - Get 3rd latest report\n"
-                    f"`!latest {source_short}` - Get latest with file\n"
-                    f"`!archive {source_short}` - Browse all reports"
-                ),
+                value=_USAGE_EXAMPLES[source_short],
                 inline=False
             )
             
@@ -310,6 +425,10 @@ class PatchCommands(commands.Cog):
     
     async def _show_history_help(self, ctx):
         """Show help for history command"""
+        await ctx.send(embed=self._history_help_embed)
+    
+    def _build_history_help_embed(self) -> discord.Embed:
+        """Build the static history help embed"""
         embed = discord.Embed(
             title="📚 History Command Help",
             description="Access historical AI analysis reports",
@@ -349,12 +468,12 @@ class PatchCommands(commands.Cog):
         )
         
         embed.set_footer(text="BDO Intelligence Archive • Command Help")
-        await ctx.send(embed=embed)
+        return embed
     
     async def _show_paginated_archive(self, ctx, source: str):
         """Show paginated archive (simplified version)"""
         try:
-            all_reports = self.db.get_all_reports(source, 50)  # Get up to 50
+            all_reports = await self._cached_digests(source, 50, 40)  # Get up to 50
             
             if not all_reports:
                 await ctx.send(f"❌ No reports found in {source} archive")
@@ -366,11 +485,7 @@ class PatchCommands(commands.Cog):
             )
             
             # Show all reports in a compact format
-            report_list = []
-            for i, report in enumerate(all_reports, 1):
-                date_short = report['generated_at'][:10]
-                title_short = report['title'][:40] + "..." if len(report['title']) > 40 else report['title']
-                report_list.append(f"`#{i}` {date_short} - {title_short}")
+            report_list = [f"`#{i}` {date_short} - {title_short}" for i, date_short, title_short in all_reports]
             
             # Split into chunks if too long
             chunk_size = 20
@@ -391,7 +506,7 @@ class PatchCommands(commands.Cog):
                     inline=False
                 )
             
-            source_short = 'gl' if 'Global' in source else 'ko'
+            source_short = _SOURCE_SHORT[source]
             embed.add_field(
                 name="📖 Access Reports",
                 value=f"Use `!history {source_short} [number]` to get specific reports",
@@ -410,22 +525,17 @@ class PatchCommands(commands.Cog):
     async def list_reports(self, ctx):
         """List available AI reports (existing command - keep as is)"""
         try:
-            reports_folder = self.ai_analyzer.reports_folder
+            # Sorted by creation time; cached between report saves
+            files_with_time = await self._cached_report_listing()
             
-            if not os.path.exists(reports_folder):
+            if files_with_time is None:
                 await ctx.send("📂 No reports folder found")
                 return
             
-            files = [f for f in os.listdir(reports_folder) if f.endswith('.txt')]
-            
-            if not files:
+            if not files_with_time:
                 await ctx.send("📂 No AI analysis reports available")
                 return
             
-            # Sort by creation time
-            files_with_time = [(f, os.path.getctime(os.path.join(reports_folder, f))) for f in files]
-            files_with_time.sort(key=lambda x: x[1], reverse=True)
-            
             embed = discord.Embed(
                 title="📊 Available AI Analysis Reports (Files)",
                 color=0x00ff88
@@ -475,16 +585,8 @@ class PatchCommands(commands.Cog):
         """Re-analyze and regenerate patch report. Usage: !patchreload gl 2"""
         
         # Validate source
-        source_map = {
-            'gl': 'Global Labs',
-            'globallab': 'Global Labs', 
-            'global': 'Global Labs',
-            'ko': 'Korean Notice',
-            'korean': 'Korean Notice',
-            'kr': 'Korean Notice'
-        }
-        
-        if source.lower() not in source_map:
+        source_name = _resolve_source(source)
+        if source_name is None:
             await ctx.send("❌ Invalid source. Use `gl` for Global Labs or `ko` for Korean notices.")
             return
         
@@ -492,13 +594,11 @@ class PatchCommands(commands.Cog):
             await ctx.send("❌ Index must be 1 or higher (1=latest, 2=second latest, etc.)")
             return
         
-        source_name = source_map[source.lower()]
-        
         # Get the report to reload
-        report_info = self.db.get_report_by_index(source_name, index)
+        report_info = await asyncio.to_thread(self.db.get_report_by_index, source_name, index)
         
         if not report_info:
-            total_reports = self.db.count_reports(source_name)
+            total_reports = await asyncio.to_thread(self.db.count_reports, source_name)
             await ctx.send(f"❌ No report found at position #{index} for {source_name}. Available: 1-{total_reports}")
             return
         
@@ -521,7 +621,7 @@ class PatchCommands(commands.Cog):
         try:
             # Regenerate the AI report using the original patch data
             patch_data = report_info['patch_data']
-            new_report_filename = await self.ai_analyzer.generate_deep_report(patch_data)
+            new_report_filename = await self.ai_analyzer.generate_deep_report(patch_data, use_cache=False)
             
             if not new_report_filename:
                 await processing_msg.edit(embed=discord.Embed(
@@ -532,7 +632,9 @@ class PatchCommands(commands.Cog):
                 return
             
             # Update database with new report
-            self.db.store_ai_report(patch_data, new_report_filename, source_name)
+            await asyncio.to_thread(self.db.store_ai_report, patch_data, new_report_filename, source_name)
+            self.invalidate(source_name)
+            self.bot.wake_notifications()
             
             # Send the new report file
             await self._send_reanalyzed_report(ctx, new_report_filename, report_info, source_name, index)
@@ -561,10 +663,13 @@ class PatchCommands(commands.Cog):
         try:
             report_path = os.path.join(self.ai_analyzer.reports_folder, filename)
             
-            if not os.path.exists(report_path):
+            report_bytes = await self._load_report_bytes(report_path)
+            if report_bytes is None:
                 await ctx.send(f"❌ Reanalyzed report file not found: {filename}")
                 return
             
+            total_reports = await self._cached_count(source)
+            
             # Create enhanced embed for reanalyzed report
             embed = discord.Embed(
                 title=f"🔄 {source} - Reanalyzed Report (#{index})",
@@ -578,7 +683,7 @@ class PatchCommands(commands.Cog):
                 value=(
                     f"**Date:** {original_report['date']}\n"
                     f"**Original Generated:** {original_report['generated_at'][:16]}\n"
-                    f"**Position:** #{index} of {self.db.count_reports(source)} total"
+                    f"**Position:** #{index} of {total_reports} total"
                 ),
                 inline=False
             )
@@ -605,14 +710,14 @@ class PatchCommands(commands.Cog):
             )
             
             # Get file size
-            file_size = os.path.getsize(report_path)
+            file_size = len(report_bytes)
             embed.add_field(
                 name="📄 File Info",
                 value=f"**Size:** {file_size:,} bytes\n**Format:** Plain Text (.txt)",
                 inline=True
             )
             
-            source_short = 'gl' if 'Global' in source else 'ko'
+            source_short = _SOURCE_SHORT[source]
             embed.add_field(
                 name="🔄 Commands",
                 value=f"`!patchreload {source_short} {index}` - Reanalyze again\n`!history {source_short}` - View all reports",
@@ -622,14 +727,11 @@ class PatchCommands(commands.Cog):
             embed.set_footer(text="🔄 Reanalyzed Report • BDO Patch Bot")
             
             # Send file with embed
-            with open(report_path, 'rb') as f:
-                discord_file = discord.File(f, filename=filename)
-                message = await ctx.send(embed=embed, file=discord_file)
+            discord_file = discord.File(io.BytesIO(report_bytes), filename=filename)
+            message = await ctx.send(embed=embed, file=discord_file)
             
-            # Add special reactions for reanalyzed reports
-            await message.add_reaction("🔄")  # Reload symbol
-            await message.add_reaction("📊")  # Analysis
-            await message.add_reaction("⭐")  # Star
+            # Add special reactions for reanalyzed reports: reload, analysis, star
+            await _add_reactions(message, "🔄", "📊", "⭐")
             
         except Exception as e:
             logger.error(f"Error sending reanalyzed report: {e}")
@@ -641,14 +743,8 @@ class PatchCommands(commands.Cog):
         """Bulk reanalyze multiple reports. Usage: !bulkreload gl 1 5"""
         
         # Validate source
-        source_map = {
-            'gl': 'Global Labs',
-            'ko': 'Korean Notice',
-            'korean': 'Korean Notice',
-            'global': 'Global Labs'
-        }
-        
-        if source.lower() not in source_map:
+        source_name = _resolve_source(source)
+        if source_name is None:
             await ctx.send("❌ Invalid source. Use `gl` or `ko`.")
             return
         
@@ -656,8 +752,7 @@ class PatchCommands(commands.Cog):
             await ctx.send("❌ Invalid range. Max 10 reports per bulk reload.")
             return
         
-        source_name = source_map[source.lower()]
-        total_reports = self.db.count_reports(source_name)
+        total_reports = await asyncio.to_thread(self.db.count_reports, source_name)
         
         if end_index > total_reports:
             await ctx.send(f"❌ Only {total_reports} reports available for {source_name}.")
@@ -701,14 +796,25 @@ class PatchCommands(commands.Cog):
                 color=0x00ff88
             ))
             
+            # Snapshot the range up front: one OFFSET lookup, then keyset paging from its cursor
+            batch = []
+            first_report = await asyncio.to_thread(self.db.get_report_by_index, source_name, start_index)
+            if first_report:
+                batch.append(first_report)
+                batch.extend(await asyncio.to_thread(
+                    self.db.get_reports_after, source_name, *first_report['cursor'], end_index - start_index
+                ))
+            
             success_count = 0
             for i in range(start_index, end_index + 1):
                 try:
-                    report_info = self.db.get_report_by_index(source_name, i)
+                    report_info = batch[i - start_index] if i - start_index < len(batch) else None
                     if report_info:
-                        new_filename = await self.ai_analyzer.generate_deep_report(report_info['patch_data'])
+                        new_filename = await self.ai_analyzer.generate_deep_report(report_info['patch_data'], use_cache=False)
                         if new_filename:
-                            self.db.store_ai_report(report_info['patch_data'], new_filename, source_name)
+                            await asyncio.to_thread(self.db.store_ai_report, report_info['patch_data'], new_filename, source_name)
+                            self.invalidate(source_name)
+                            self.bot.wake_notifications()
                             success_count += 1
                             await ctx.send(f"✅ Reanalyzed report #{i}: {report_info['title'][:50]}...")
                 except Exception as e:
@@ -739,12 +845,34 @@ class PatchCommands(commands.Cog):
     async def help_command(self, ctx):
         """Show comprehensive help information for all bot commands"""
         
+        embed = self._help_embed.copy()
+        embed.timestamp = ctx.message.created_at
+        
+        # Footer with additional info
+        embed.set_footer(
+            text="BDO Intelligence Division • AI-Powered Analysis • Developed for Competitive Players",
+            icon_url=ctx.bot.user.avatar.url if ctx.bot.user.avatar else None
+        )
+        
+        # Add thumbnail if bot has avatar
+        if ctx.bot.user.avatar:
+            embed.set_thumbnail(url=ctx.bot.user.avatar.url)
+        
+        # Send the main help embed
+        message = await ctx.send(embed=embed)
+        
+        # Add helpful reactions: analysis, config, archive, AI
+        await _add_reactions(message, "📊", "⚙️", "📚", "🤖")
+        
+        await ctx.send(embed=self._help_followup_embed)
+    
+    def _build_help_embed(self) -> discord.Embed:
+        """Build the static part of the main help embed"""
         # Create main help embed
         embed = discord.Embed(
             title="📖 BDO Patch Bot - Complete Command Guide",
             description="🤖 **AI-Powered Black Desert Online Patch Analysis & Intelligence Reports**\n\n*Your comprehensive BDO patch monitoring and analysis companion*",
-            color=0x0099ff,
-            timestamp=ctx.message.created_at
+            color=0x0099ff
         )
         
         # Latest Reports Section
@@ -865,29 +993,11 @@ class PatchCommands(commands.Cog):
             inline=False
         )
         
-        # Footer with additional info
-        embed.set_footer(
-            text="BDO Intelligence Division • AI-Powered Analysis • Developed for Competitive Players",
-            icon_url=ctx.bot.user.avatar.url if ctx.bot.user.avatar else None
-        )
-        
-        # Add thumbnail if bot has avatar
-        if ctx.bot.user.avatar:
-            embed.set_thumbnail(url=ctx.bot.user.avatar.url)
-        
-        # Send the main help embed
-        message = await ctx.send(embed=embed)
-        
-        # Add helpful reactions
-        try:
-            await message.add_reaction("📊")  # Analysis
-            await message.add_reaction("⚙️")  # Config
-            await message.add_reaction("📚")  # Archive
-            await message.add_reaction("🤖")  # AI
-        except:
-            pass  # Ignore reaction errors
-        
-        # Send follow-up embed with permissions and troubleshooting
+        return embed
+    
+    def _build_help_followup_embed(self) -> discord.Embed:
+        """Build the static follow-up help embed"""
+        # Follow-up embed with permissions and troubleshooting
         followup_embed = discord.Embed(
             title="🔧 Additional Information",
             color=0x36393f
@@ -925,7 +1035,7 @@ class PatchCommands(commands.Cog):
             inline=False
         )
         
-        await ctx.send(embed=followup_embed)
+        return followup_embed
 
 # Setup function
 async def setup(bot):
@@ -14,6 +14,8 @@ class Config:
     # AI Configuration
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
     GEMINI_MODEL = 'gemini-2.5-flash'
+    _model = None  # Shared GenerativeModel, created by initialize_gemini()
+    _validated = False
     
     # BDO URLs - Updated with your requested URLs
     KOREAN_NOTICE_URL = "https://www.kr.playblackdesert.com/ko-KR/News/Notice?boardType=2"
@@ -21,6 +23,7 @@ class Config:
     
     # Bot Settings
     CHECK_INTERVAL_MINUTES = 15  # More frequent for dual monitoring
+    MAX_CONCURRENT_ANALYSES = 8  # Parallel Gemini report generations
     COMMAND_PREFIX = '!'
     
     # Language Support
@@ -39,6 +42,10 @@ class Config:
     MAX_DISCORD_FIELD_LENGTH = 1024
     MAX_DISCORD_MESSAGE_LENGTH = 2000
     
+    # Report Cache
+    REPORT_CACHE_MAX_ENTRIES = 128
+    TRANSLATION_CACHE_MAX_ENTRIES = 256
+    
     @classmethod
     def validate_config(cls):
         """Validate configuration"""
@@ -50,10 +57,17 @@ class Config:
         if errors:
             raise ValueError("\n".join(errors))
     
+    @classmethod
+    def ensure_valid(cls):
+        """Validate configuration once, at bot startup"""
+        if not cls._validated:
+            cls.validate_config()
+            cls._validated = True
+    
     @classmethod
     def initialize_gemini(cls):
-        """Initialize Gemini AI"""
-        genai.configure(api_key=cls.GEMINI_API_KEY)
-        return genai.GenerativeModel(cls.GEMINI_MODEL)
-
-Config.validate_config()
+        """Initialize Gemini AI once and return the shared model"""
+        if cls._model is None:
+            genai.configure(api_key=cls.GEMINI_API_KEY)
+            cls._model = genai.GenerativeModel(cls.GEMINI_MODEL)
+        return cls._model
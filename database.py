@@ -1,347 +1,614 @@
 """Fixed database methods with proper date-based ordering"""
+import calendar
+import functools
 import sqlite3
 import logging
-from typing import Optional, Dict, Any, List
-import json
-from datetime import datetime
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Set, Tuple
+import orjson
+from datetime import date
 import re
 
 logger = logging.getLogger(__name__)
 
+# Applied once per connection: WAL lets readers proceed while a report is written,
+# and synchronous=NORMAL is durable enough under WAL without an fsync per commit
+_CONNECTION_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+    "cache_size=-20000",
+)
+
+# Stored for reports whose date could not be parsed, so they sort oldest
+_NO_DATE = '1900-01-01'
+
+def _date_ordinal(iso_date: str) -> int:
+    """Day number of a YYYY-MM-DD date, as stored in parsed_ordinal"""
+    return date.fromisoformat(iso_date).toordinal()
+
+def _report_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    """Report dict from an ai_reports row, decoding patch_data and folding (parsed_ordinal, id) into a cursor"""
+    report = dict(row)
+    if 'patch_data' in report:
+        report['patch_data'] = orjson.loads(report['patch_data'])
+    if 'parsed_ordinal' in report:
+        report['cursor'] = (report.pop('parsed_ordinal'), report.pop('id'))
+    return report
+
+# Date parsing tables, built once instead of on every _parse_date call
+_EXACT_DATE_RE = re.compile(
+    r'(?P<y1>\d{4})(?P<sep>[-./])(?P<m1>\d{1,2})(?P=sep)(?P<d1>\d{1,2})'        # 2025-08-06, 2025.08.06, 2025/08/06
+    r'|(?P<mon>Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(?P<d2>\d{1,2}),\s+(?P<y2>\d{4})'  # Aug 6, 2025
+    r'|(?P<m3>\d{1,2})/(?P<d3>\d{1,2})/(?P<y3>\d{4})',                        # 08/06/2025
+    re.IGNORECASE
+)
+_DATE_PATTERNS = (
+    re.compile(r'(\d{4})[.-](\d{1,2})[.-](\d{1,2})'),  # 2025-08-06 or 2025.08.06
+    re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})'),  # 08/06/2025
+    re.compile(r'(Aug|Jul|Sep|Oct|Nov|Dec|Jan|Feb|Mar|Apr|May|Jun)\s+(\d{1,2}),?\s+(\d{4})', re.IGNORECASE)  # Aug 6, 2025
+)
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+_YEAR_RE = re.compile(r'\d{4}')
+_NUMBER_RE = re.compile(r'\d+')
+
+def _format_ymd(year: int, month: int, day: int) -> Optional[str]:
+    """Format a calendar date as YYYY-MM-DD, or None if it does not exist"""
+    if 1 <= year <= 9999 and 1 <= month <= 12 and 1 <= day <= calendar.monthrange(year, month)[1]:
+        return f"{year:04d}-{month:02d}-{day:02d}"
+    return None
+
+def _parse_date_impl(date_str: str) -> Optional[str]:
+    """Parse various date formats into YYYY-MM-DD format"""
+    if not date_str:
+        return None
+    
+    try:
+        # Clean the date string
+        date_str = date_str.strip()
+        
+        # Fast path for YYYY-MM-DD / YYYY.MM.DD / YYYY/MM/DD, the dominant shape
+        if (len(date_str) == 10 and date_str[4] in '-./' and date_str[7] == date_str[4]
+                and date_str[:4].isdigit() and date_str[5:7].isdigit() and date_str[8:].isdigit()):
+            iso = _format_ymd(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:]))
+            if iso:
+                return iso
+        
+        # Try the exact formats with one anchored regex instead of a strptime loop
+        match = _EXACT_DATE_RE.fullmatch(date_str)
+        if match:
+            if match['y1']:
+                iso = _format_ymd(int(match['y1']), int(match['m1']), int(match['d1']))
+            elif match['y2']:
+                iso = _format_ymd(int(match['y2']), _MONTHS[match['mon'].lower()], int(match['d2']))
+            else:
+                iso = _format_ymd(int(match['y3']), int(match['m3']), int(match['d3']))
+            if iso:
+                return iso
+        
+        # Try regex patterns for partial matches
+        for pattern in _DATE_PATTERNS:
+            match = pattern.search(date_str)
+            if match:
+                groups = match.groups()
+                if len(groups) == 3:
+                    if _YEAR_RE.match(groups[0]):  # Year first
+                        year, month, day = groups
+                    elif groups[2].isdigit() and len(groups[2]) == 4:  # Year last
+                        month, day, year = groups
+                        if groups[0].isalpha():  # Month name
+                            month = _MONTHS.get(groups[0].lower()[:3], 1)
+                    else:
+                        continue
+                    # Validated up front, so an impossible date moves on without raising
+                    iso = _format_ymd(int(year), int(month), int(day))
+                    if iso:
+                        return iso
+        
+        # If all parsing fails, try to extract just year-month-day numbers
+        numbers = _NUMBER_RE.findall(date_str)
+        if len(numbers) >= 3:
+            # Assume first number > 2000 is year
+            for num in numbers:
+                if int(num) > 2000:
+                    year = int(num)
+                    remaining = [int(x) for x in numbers if x != num]
+                    if len(remaining) >= 2:
+                        month, day = remaining[0], remaining[1]
+                        if month > 12:  # Swap if needed
+                            month, day = day, month
+                        iso = _format_ymd(year, month, day)
+                        if iso:
+                            return iso
+    
+    except Exception as e:
+        logger.error(f"Error parsing date '{date_str}': {e}")
+    
+    return None
+
+# Patch lists are rescraped every cycle, so the same date strings repeat constantly
+_parse_date_cached = functools.lru_cache(maxsize=2048)(_parse_date_impl)
+
 class BotDatabase:
     """Fixed database with proper patch date ordering"""
     
     def __init__(self, db_path: str = "bdo_bot.db"):
         self.db_path = db_path
+        
+        # One long-lived connection shared by every method; calls arrive from
+        # the event loop and from worker threads, so access is serialized
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        for pragma in _CONNECTION_PRAGMAS:
+            self._conn.execute(f"PRAGMA {pragma}")
         self._create_tables()
+        
+        # Server configs are read per event and written rarely, so serve them from memory
+        self._server_cache: Dict[int, Dict[str, Any]] = self._load_server_configs()
+    
+    @contextmanager
+    def _connect(self):
+        """Yield the shared connection inside a transaction, one caller at a time"""
+        with self._lock, self._conn:
+            yield self._conn
+    
+    def close(self):
+        """Close the shared connection"""
+        with self._lock:
+            self._conn.close()
     
     def _create_tables(self):
         """Create database tables with date parsing"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._connect() as conn:
+                # Databases created before parsed_ordinal existed get the column first,
+                # since the schema script below indexes it
+                columns = {row[1] for row in conn.execute('PRAGMA table_info(ai_reports)')}
+                if columns and 'parsed_ordinal' not in columns:
+                    conn.execute('ALTER TABLE ai_reports ADD COLUMN parsed_ordinal INTEGER')
                 
-                # Server configurations
-                cursor.execute('''
+                # The whole schema is parsed once and applied atomically
+                conn.executescript('''
+                    BEGIN;
+                    
+                    -- Server configurations
                     CREATE TABLE IF NOT EXISTS server_configs (
                         guild_id INTEGER PRIMARY KEY,
                         patch_channel_id INTEGER,
                         language TEXT DEFAULT 'en',
                         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                
-                # Enhanced AI reports table with date parsing
-                cursor.execute('''
+                    );
+                    
+                    -- Enhanced AI reports table with date parsing
                     CREATE TABLE IF NOT EXISTS ai_reports (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         source TEXT NOT NULL,
                         patch_id TEXT NOT NULL,
                         title TEXT NOT NULL,
                         date TEXT,
-                        parsed_date DATE,  -- NEW: Properly parsed date for ordering
+                        parsed_date DATE NOT NULL DEFAULT '1900-01-01',  -- NEW: Properly parsed date (_NO_DATE when unknown)
+                        parsed_ordinal INTEGER NOT NULL DEFAULT 693596,  -- parsed_date as a day number, used for ordering
                         link TEXT,
                         report_filename TEXT,
                         generated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         is_notified BOOLEAN DEFAULT FALSE,
                         patch_data JSON,
                         UNIQUE(source, patch_id)
-                    )
-                ''')
-                
-                # Create index for better performance
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_reports_source_date 
-                    ON ai_reports(source, parsed_date DESC, id DESC)
+                    );
+                    
+                    -- Undated rows sort last via the _NO_DATE sentinel instead of a CASE in every ORDER BY.
+                    -- New tables enforce it with NOT NULL defaults; older tables keep nullable
+                    -- columns (SQLite cannot add constraints in place), so backfill them here
+                    UPDATE ai_reports SET parsed_date = '1900-01-01' WHERE parsed_date IS NULL;
+                    DROP INDEX IF EXISTS idx_reports_source_order;
+                    
+                    -- Integer day numbers make smaller index entries than ISO date text;
+                    -- julianday() - 1721424.5 equals date.toordinal() for the backfill
+                    UPDATE ai_reports 
+                    SET parsed_ordinal = CAST(julianday(parsed_date) - 1721424.5 AS INTEGER)
+                    WHERE parsed_ordinal IS NULL;
+                    
+                    -- Create index for better performance
+                    CREATE INDEX IF NOT EXISTS idx_reports_source_ordinal 
+                    ON ai_reports(source, parsed_ordinal DESC, id DESC);
+                    DROP INDEX IF EXISTS idx_reports_source_date;
+                    
+                    -- Only the small unnotified tail is indexed; the WHERE clause must match
+                    -- get_unnotified_reports for the planner to use it
+                    CREATE INDEX IF NOT EXISTS idx_reports_unnotified 
+                    ON ai_reports(generated_at) WHERE is_notified = FALSE;
+                    
+                    -- Per-source report counts kept current by triggers, so counting is a key lookup
+                    CREATE TABLE IF NOT EXISTS source_counts (
+                        source TEXT PRIMARY KEY,
+                        cnt INTEGER NOT NULL DEFAULT 0
+                    );
+                    CREATE TRIGGER IF NOT EXISTS tr_ai_reports_count_insert AFTER INSERT ON ai_reports
+                    BEGIN
+                        INSERT INTO source_counts (source, cnt) VALUES (NEW.source, 1)
+                        ON CONFLICT(source) DO UPDATE SET cnt = cnt + 1;
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS tr_ai_reports_count_delete AFTER DELETE ON ai_reports
+                    BEGIN
+                        UPDATE source_counts SET cnt = cnt - 1 WHERE source = OLD.source;
+                    END;
+                    
+                    -- Recount once per startup in case rows changed without the triggers
+                    DELETE FROM source_counts;
+                    INSERT INTO source_counts (source, cnt) SELECT source, COUNT(*) FROM ai_reports GROUP BY source;
+                    
+                    -- AI analyses keyed by a hash of their prompt, backing PatchReportCache
+                    CREATE TABLE IF NOT EXISTS answer_cache (
+                        key TEXT PRIMARY KEY,
+                        report TEXT NOT NULL,
+                        ts INTEGER,
+                        hits INTEGER DEFAULT 0
+                    );
+                    
+                    COMMIT;
+                    
+                    -- Refresh planner statistics when they are stale
+                    PRAGMA optimize;
                 ''')
-                
-                conn.commit()
                 logger.info("Updated database tables created successfully")
                 
-        except Exception as e:
+        except sqlite3.Error as e:
             logger.error(f"Database creation error: {e}")
     
     def _parse_date(self, date_str: str) -> Optional[str]:
         """Parse various date formats into YYYY-MM-DD format"""
         if not date_str:
             return None
-            
-        try:
-            # Clean the date string
-            date_str = date_str.strip()
-            
-            # Try different formats
-            formats = [
-                '%Y-%m-%d',          # 2025-08-06
-                '%Y.%m.%d',          # 2025.08.06
-                '%b %d, %Y',         # Aug 6, 2025
-                '%Y/%m/%d',          # 2025/08/06
-                '%m/%d/%Y'           # 08/06/2025
-            ]
-            
-            for fmt in formats:
-                try:
-                    parsed = datetime.strptime(date_str, fmt)
-                    return parsed.strftime('%Y-%m-%d')
-                except:
-                    continue
-            
-            # Try regex patterns for partial matches
-            patterns = [
-                r'(\d{4})[.-](\d{1,2})[.-](\d{1,2})',  # 2025-08-06 or 2025.08.06
-                r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})',  # 08/06/2025
-                r'(Aug|Jul|Sep|Oct|Nov|Dec|Jan|Feb|Mar|Apr|May|Jun)\s+(\d{1,2}),?\s+(\d{4})'  # Aug 6, 2025
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, date_str, re.IGNORECASE)
-                if match:
-                    groups = match.groups()
-                    if len(groups) == 3:
-                        try:
-                            if re.match(r'\d{4}', groups[0]):  # Year first
-                                year, month, day = groups
-                                parsed = datetime(int(year), int(month), int(day))
-                            elif groups[2].isdigit() and len(groups[2]) == 4:  # Year last
-                                month, day, year = groups
-                                if groups[0].isalpha():  # Month name
-                                    month_names = {
-                                        'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-                                        'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-                                    }
-                                    month = month_names.get(groups[0].lower()[:3], 1)
-                                parsed = datetime(int(year), int(month), int(day))
-                            return parsed.strftime('%Y-%m-%d')
-                        except:
-                            continue
-            
-            # If all parsing fails, try to extract just year-month-day numbers
-            numbers = re.findall(r'\d+', date_str)
-            if len(numbers) >= 3:
-                # Assume first number > 2000 is year
-                for i, num in enumerate(numbers):
-                    if int(num) > 2000:
-                        try:
-                            year = int(num)
-                            remaining = [int(x) for x in numbers if x != num]
-                            if len(remaining) >= 2:
-                                month, day = remaining[0], remaining[1]
-                                if month > 12:  # Swap if needed
-                                    month, day = day, month
-                                parsed = datetime(year, month, day)
-                                return parsed.strftime('%Y-%m-%d')
-                        except:
-                            continue
-            
-        except Exception as e:
-            logger.error(f"Error parsing date '{date_str}': {e}")
-        
-        return None
+        return _parse_date_cached(date_str)
+    
+    def _report_row(self, patch_data: Dict[str, Any], report_filename: str, source: str, parsed_date: str) -> tuple:
+        """Parameters for the ai_reports insert statements"""
+        return (
+            source,
+            patch_data['id'],
+            patch_data['title'],
+            patch_data.get('date', ''),
+            parsed_date,
+            _date_ordinal(parsed_date),
+            patch_data.get('link', ''),
+            report_filename,
+            orjson.dumps(patch_data).decode()
+        )
     
     def store_ai_report(self, patch_data: Dict[str, Any], report_filename: str, source: str) -> bool:
         """Store AI report with proper date parsing"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 # Parse the date properly
-                parsed_date = self._parse_date(patch_data.get('date', ''))
+                parsed_date = self._parse_date(patch_data.get('date', '')) or _NO_DATE
                 
+                # An upsert rather than OR REPLACE: REPLACE deletes without firing the
+                # delete trigger, which would leave source_counts overcounted
                 cursor.execute('''
-                    INSERT OR REPLACE INTO ai_reports 
-                    (source, patch_id, title, date, parsed_date, link, report_filename, patch_data, generated_at, is_notified) 
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, FALSE)
-                ''', (
-                    source,
-                    patch_data['id'],
-                    patch_data['title'],
-                    patch_data.get('date', ''),
-                    parsed_date,
-                    patch_data.get('link', ''),
-                    report_filename,
-                    json.dumps(patch_data)
-                ))
+                    INSERT INTO ai_reports 
+                    (source, patch_id, title, date, parsed_date, parsed_ordinal, link, report_filename, patch_data, generated_at, is_notified) 
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, FALSE)
+                    ON CONFLICT(source, patch_id) DO UPDATE SET
+                        title = excluded.title,
+                        date = excluded.date,
+                        parsed_date = excluded.parsed_date,
+                        parsed_ordinal = excluded.parsed_ordinal,
+                        link = excluded.link,
+                        report_filename = excluded.report_filename,
+                        patch_data = excluded.patch_data,
+                        generated_at = excluded.generated_at,
+                        is_notified = excluded.is_notified
+                ''', self._report_row(patch_data, report_filename, source, parsed_date))
                 conn.commit()
                 logger.info(f"Stored AI report: {report_filename} with parsed date: {parsed_date}")
                 return True
                 
-        except Exception as e:
+        except (sqlite3.Error, KeyError, TypeError) as e:
             logger.error(f"Error storing AI report: {e}")
             return False
     
+    def store_ai_reports_bulk(self, reports: List[Tuple[Dict[str, Any], str]], source: str) -> int:
+        """Store several (patch_data, report_filename) pairs in one transaction; returns rows inserted"""
+        try:
+            rows = [
+                self._report_row(patch_data, report_filename, source,
+                                 self._parse_date(patch_data.get('date', '')) or _NO_DATE)
+                for patch_data, report_filename in reports
+            ]
+            with self._connect() as conn:
+                # rowcount counts only the inserted rows, not the source_counts trigger updates
+                inserted = conn.executemany('''
+                    INSERT OR IGNORE INTO ai_reports 
+                    (source, patch_id, title, date, parsed_date, parsed_ordinal, link, report_filename, patch_data, generated_at, is_notified) 
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, FALSE)
+                ''', rows).rowcount
+                
+                logger.info(f"Stored {inserted} of {len(rows)} AI reports for {source}")
+                return inserted
+                
+        except (sqlite3.Error, KeyError, TypeError) as e:
+            logger.error(f"Error storing AI reports: {e}")
+            return 0
+    
     def get_latest_report(self, source: str) -> Optional[Dict[str, Any]]:
         """Get latest AI report based on actual patch date - FIXED"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT patch_id, title, date, link, report_filename, generated_at, patch_data, parsed_date
                     FROM ai_reports 
                     WHERE source = ? 
                     ORDER BY 
-                        CASE WHEN parsed_date IS NOT NULL THEN parsed_date ELSE '1900-01-01' END DESC,
-                        generated_at DESC,
+                        parsed_ordinal DESC,
                         id DESC
                     LIMIT 1
                 ''', (source,))
                 
                 result = cursor.fetchone()
                 if result:
-                    return {
-                        'patch_id': result[0],
-                        'title': result[1],
-                        'date': result[2],
-                        'link': result[3],
-                        'report_filename': result[4],
-                        'generated_at': result[5],
-                        'patch_data': json.loads(result[6]),
-                        'parsed_date': result[7]
-                    }
+                    return _report_from_row(result)
                     
-        except Exception as e:
+        except (sqlite3.Error, orjson.JSONDecodeError) as e:
             logger.error(f"Error getting latest report: {e}")
         
         return None
     
+    def get_latest_report_with_count(self, source: str) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Get latest report metadata (without patch_data) together with the source's report count"""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT t.total, r.patch_id, r.title, r.date, r.link, r.report_filename,
+                           r.generated_at, r.parsed_date
+                    FROM (SELECT IFNULL((SELECT cnt FROM source_counts WHERE source = ?), 0) AS total) t
+                    LEFT JOIN (
+                        SELECT patch_id, title, date, link, report_filename, generated_at, parsed_date
+                        FROM ai_reports 
+                        WHERE source = ? 
+                        ORDER BY 
+                            parsed_ordinal DESC,
+                            id DESC
+                        LIMIT 1
+                    ) r ON 1
+                ''', (source, source))
+                
+                report = _report_from_row(cursor.fetchone())
+                total = report.pop('total')
+                if report['patch_id'] is None:
+                    return None, total
+                
+                return report, total
+                    
+        except sqlite3.Error as e:
+            logger.error(f"Error getting latest report: {e}")
+        
+        return None, 0
+    
     def get_report_by_index(self, source: str, index: int) -> Optional[Dict[str, Any]]:
         """Get report by chronological index (1=latest by patch date)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
-                    SELECT patch_id, title, date, link, report_filename, generated_at, patch_data, parsed_date
+                    SELECT patch_id, title, date, link, report_filename, generated_at, patch_data, parsed_date,
+                           parsed_ordinal, id
                     FROM ai_reports 
                     WHERE source = ? 
                     ORDER BY 
-                        CASE WHEN parsed_date IS NOT NULL THEN parsed_date ELSE '1900-01-01' END DESC,
-                        generated_at DESC,
+                        parsed_ordinal DESC,
                         id DESC
                     LIMIT 1 OFFSET ?
                 ''', (source, index - 1))
                 
                 result = cursor.fetchone()
                 if result:
-                    return {
-                        'patch_id': result[0],
-                        'title': result[1],
-                        'date': result[2],
-                        'link': result[3],
-                        'report_filename': result[4],
-                        'generated_at': result[5],
-                        'patch_data': json.loads(result[6]),
-                        'parsed_date': result[7]
-                    }
+                    return _report_from_row(result)
                     
-        except Exception as e:
+        except (sqlite3.Error, orjson.JSONDecodeError) as e:
             logger.error(f"Error getting report by index: {e}")
         
         return None
     
+    def get_reports_after(self, source: str, cursor_ordinal: int, cursor_id: int, limit: int) -> List[Dict[str, Any]]:
+        """Get the reports that follow a (parsed_ordinal, id) cursor, for paging without OFFSET"""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT patch_id, title, date, link, report_filename, generated_at, patch_data, parsed_date,
+                           parsed_ordinal, id
+                    FROM ai_reports 
+                    WHERE source = ? 
+                      AND (parsed_ordinal, id) < (?, ?)
+                    ORDER BY 
+                        parsed_ordinal DESC,
+                        id DESC
+                    LIMIT ?
+                ''', (source, cursor_ordinal, cursor_id, limit))
+                
+                return [_report_from_row(row) for row in cursor.fetchall()]
+                
+        except (sqlite3.Error, orjson.JSONDecodeError) as e:
+            logger.error(f"Error getting reports after cursor: {e}")
+            return []
+    
+    def get_report_by_index_with_total(self, source: str, index: int) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Get report metadata (without patch_data) by chronological index together with the source's report count"""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT t.total, r.patch_id, r.title, r.date, r.link, r.report_filename,
+                           r.generated_at, r.parsed_date
+                    FROM (SELECT IFNULL((SELECT cnt FROM source_counts WHERE source = ?), 0) AS total) t
+                    LEFT JOIN (
+                        SELECT patch_id, title, date, link, report_filename, generated_at, parsed_date
+                        FROM ai_reports 
+                        WHERE source = ? 
+                        ORDER BY 
+                            parsed_ordinal DESC,
+                            id DESC
+                        LIMIT 1 OFFSET ?
+                    ) r ON 1
+                ''', (source, source, index - 1))
+                
+                report = _report_from_row(cursor.fetchone())
+                total = report.pop('total')
+                if report['patch_id'] is None:
+                    return None, total
+                
+                return report, total
+                    
+        except sqlite3.Error as e:
+            logger.error(f"Error getting report by index: {e}")
+        
+        return None, 0
+    
     def get_all_reports(self, source: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get all reports ordered by patch date"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT patch_id, title, date, link, report_filename, generated_at, patch_data, parsed_date
                     FROM ai_reports 
                     WHERE source = ? 
                     ORDER BY 
-                        CASE WHEN parsed_date IS NOT NULL THEN parsed_date ELSE '1900-01-01' END DESC,
-                        generated_at DESC,
+                        parsed_ordinal DESC,
                         id DESC
                     LIMIT ?
                 ''', (source, limit))
                 
-                results = []
-                for row in cursor.fetchall():
-                    results.append({
-                        'patch_id': row[0],
-                        'title': row[1],
-                        'date': row[2],
-                        'link': row[3],
-                        'report_filename': row[4],
-                        'generated_at': row[5],
-                        'patch_data': json.loads(row[6]),
-                        'parsed_date': row[7]
-                    })
-                
-                return results
-                
-        except Exception as e:
+                return [_report_from_row(row) for row in cursor.fetchall()]
+                
+        except (sqlite3.Error, orjson.JSONDecodeError) as e:
             logger.error(f"Error getting all reports: {e}")
             return []
     
+    def get_report_digests(self, source: str, limit: int, title_len: int) -> List[Tuple[int, str, str]]:
+        """Get (index, generated date, shortened title) rows for report listings"""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT 
+                        row_number() OVER (
+                            ORDER BY 
+                                parsed_ordinal DESC,
+                                id DESC
+                        ),
+                        substr(generated_at, 1, 10),
+                        CASE WHEN length(title) > ? THEN substr(title, 1, ?) || '...' ELSE title END
+                    FROM ai_reports 
+                    WHERE source = ? 
+                    ORDER BY 
+                        parsed_ordinal DESC,
+                        id DESC
+                    LIMIT ?
+                ''', (title_len, title_len, source, limit))
+                
+                return [tuple(row) for row in cursor.fetchall()]
+                
+        except sqlite3.Error as e:
+            logger.error(f"Error getting report digests: {e}")
+            return []
+    
     def update_existing_dates(self):
         """Update existing records with parsed dates - RUN ONCE"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 # Get all records without parsed_date
-                cursor.execute('SELECT id, date FROM ai_reports WHERE parsed_date IS NULL')
+                cursor.execute('SELECT id, date FROM ai_reports WHERE parsed_date IS NULL OR parsed_date = ?',
+                               (_NO_DATE,))
                 records = cursor.fetchall()
                 
+                # One prepared statement for every row, committed as a single transaction
+                updates = []
                 for record_id, date_str in records:
-                    parsed_date = self._parse_date(date_str)
-                    cursor.execute('UPDATE ai_reports SET parsed_date = ? WHERE id = ?', 
-                                 (parsed_date, record_id))
+                    parsed_date = self._parse_date(date_str) or _NO_DATE
+                    updates.append((parsed_date, _date_ordinal(parsed_date), record_id))
+                cursor.executemany('UPDATE ai_reports SET parsed_date = ?, parsed_ordinal = ? WHERE id = ?', updates)
                 
                 conn.commit()
                 logger.info(f"Updated {len(records)} records with parsed dates")
                 
-        except Exception as e:
+        except sqlite3.Error as e:
             logger.error(f"Error updating existing dates: {e}")
     
     def count_reports(self, source: str) -> int:
         """Count total reports for a source - NEW METHOD"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
-                cursor.execute('SELECT COUNT(*) FROM ai_reports WHERE source = ?', (source,))
-                return cursor.fetchone()[0]
-        except Exception as e:
+                cursor.execute('SELECT cnt FROM source_counts WHERE source = ?', (source,))
+                result = cursor.fetchone()
+                return result[0] if result else 0
+        except sqlite3.Error as e:
             logger.error(f"Error counting reports: {e}")
             return 0
 
-    def is_report_new(self, source: str, patch_id: str) -> bool:
-        """Check if we need to generate a new report"""
+    def filter_new_ids(self, source: str, patch_ids: List[str]) -> Set[str]:
+        """Return the patch ids that don't have a stored report yet, with one query"""
+        if not patch_ids:
+            return set()
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT id FROM ai_reports 
-                    WHERE source = ? AND patch_id = ?
-                ''', (source, patch_id))
+            with self._connect() as conn:
+                placeholders = ','.join('?' * len(patch_ids))
+                cursor = conn.execute(
+                    f'SELECT patch_id FROM ai_reports WHERE source = ? AND patch_id IN ({placeholders})',
+                    (source, *patch_ids)
+                )
+                return set(patch_ids).difference(row[0] for row in cursor.fetchall())
                 
-                return cursor.fetchone() is None
+        except sqlite3.Error as e:
+            logger.error(f"Error checking which reports are new: {e}")
+            return set(patch_ids)
+    
+    def get_all_ids(self, source: str) -> List[str]:
+        """Get the patch ids of every stored report for a source"""
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute('SELECT patch_id FROM ai_reports WHERE source = ?', (source,))
+                return [row[0] for row in cursor.fetchall()]
                 
-        except Exception as e:
-            logger.error(f"Error checking if report is new: {e}")
-            return True
+        except sqlite3.Error as e:
+            logger.error(f"Error getting report ids: {e}")
+            return []
     
-    def mark_report_notified(self, source: str, patch_id: str) -> bool:
-        """Mark report as notified to Discord"""
+    def mark_reports_notified(self, keys: List[Tuple[str, str]]) -> bool:
+        """Mark several (source, patch_id) reports as notified in one transaction"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
+            with self._connect() as conn:
+                conn.executemany('''
                     UPDATE ai_reports 
                     SET is_notified = TRUE 
                     WHERE source = ? AND patch_id = ?
-                ''', (source, patch_id))
+                ''', keys)
                 conn.commit()
                 return True
                 
-        except Exception as e:
-            logger.error(f"Error marking report as notified: {e}")
+        except sqlite3.Error as e:
+            logger.error(f"Error marking reports as notified: {e}")
             return False
     
     def get_unnotified_reports(self) -> List[Dict[str, Any]]:
         """Get reports that haven't been sent to Discord yet"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT source, patch_id, title, report_filename, patch_data
@@ -350,95 +617,124 @@ class BotDatabase:
                     ORDER BY generated_at ASC
                 ''')
                 
-                results = []
-                for row in cursor.fetchall():
-                    results.append({
-                        'source': row[0],
-                        'patch_id': row[1],
-                        'title': row[2],
-                        'report_filename': row[3],
-                        'patch_data': json.loads(row[4])
-                    })
+                return [_report_from_row(row) for row in cursor.fetchall()]
                 
-                return results
-                
-        except Exception as e:
+        except (sqlite3.Error, orjson.JSONDecodeError) as e:
             logger.error(f"Error getting unnotified reports: {e}")
             return []
     
+    # Analysis cache methods
+    def get_cached_analysis(self, key: str) -> Optional[str]:
+        """Get a persisted AI analysis by prompt key"""
+        try:
+            with self._connect() as conn:
+                row = conn.execute('SELECT report FROM answer_cache WHERE key = ?', (key,)).fetchone()
+                return row[0] if row else None
+                
+        except sqlite3.Error as e:
+            logger.error(f"Error reading report cache: {e}")
+            return None
+    
+    def store_cached_analysis(self, key: str, report: str) -> bool:
+        """Persist an AI analysis under its prompt key"""
+        try:
+            with self._connect() as conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO answer_cache (key, report, ts, hits)
+                    VALUES (?, ?, ?, 0)
+                ''', (key, report, int(time.time())))
+                return True
+                
+        except sqlite3.Error as e:
+            logger.error(f"Error writing report cache: {e}")
+            return False
+    
+    def add_cached_analysis_hits(self, hits: List[Tuple[str, int]]) -> bool:
+        """Add (key, count) hit counts to persisted analyses in one transaction"""
+        try:
+            with self._connect() as conn:
+                conn.executemany('UPDATE answer_cache SET hits = hits + ? WHERE key = ?',
+                                 [(count, key) for key, count in hits])
+                return True
+                
+        except sqlite3.Error as e:
+            logger.error(f"Error updating report cache hits: {e}")
+            return False
+    
     # Server configuration methods
     def set_patch_channel(self, guild_id: int, channel_id: int) -> bool:
         """Set patch notification channel for a server"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
-                    INSERT OR REPLACE INTO server_configs 
+                    INSERT INTO server_configs 
                     (guild_id, patch_channel_id, updated_at) 
                     VALUES (?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(guild_id) DO UPDATE SET
+                        patch_channel_id = excluded.patch_channel_id,
+                        updated_at = excluded.updated_at
                 ''', (guild_id, channel_id))
                 conn.commit()
+                self._server_cache.setdefault(guild_id, {'channel_id': None, 'language': 'en'})['channel_id'] = channel_id
                 return True
-        except Exception as e:
+        except sqlite3.Error as e:
             logger.error(f"Error setting patch channel: {e}")
             return False
     
     def set_language(self, guild_id: int, language: str) -> bool:
         """Set language for a server"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
-                    INSERT OR REPLACE INTO server_configs 
+                    INSERT INTO server_configs 
                     (guild_id, language, updated_at) 
                     VALUES (?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(guild_id) DO UPDATE SET
+                        language = excluded.language,
+                        updated_at = excluded.updated_at
                 ''', (guild_id, language))
                 conn.commit()
+                self._server_cache.setdefault(guild_id, {'channel_id': None, 'language': 'en'})['language'] = language
                 return True
-        except Exception as e:
+        except sqlite3.Error as e:
             logger.error(f"Error setting language: {e}")
             return False
     
-    def get_server_config(self, guild_id: int) -> Optional[Dict[str, Any]]:
-        """Get server configuration"""
+    def _load_server_configs(self) -> Dict[int, Dict[str, Any]]:
+        """Read every server config into a guild_id -> config dict"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT patch_channel_id, language 
-                    FROM server_configs 
-                    WHERE guild_id = ?
-                ''', (guild_id,))
-                
-                result = cursor.fetchone()
-                if result:
-                    return {
-                        'channel_id': result[0],
-                        'language': result[1]
-                    }
-        except Exception as e:
-            logger.error(f"Error getting server config: {e}")
-        return None
-    
-    def get_all_configured_servers(self) -> List[Dict[str, Any]]:
-        """Get all servers with patch channels configured"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT guild_id, patch_channel_id, language 
-                    FROM server_configs 
-                    WHERE patch_channel_id IS NOT NULL
+                    FROM server_configs
                 ''')
                 
-                return [
-                    {
-                        'guild_id': row[0],
-                        'channel_id': row[1],
-                        'language': row[2] or 'en'
-                    }
+                return {
+                    row['guild_id']: {'channel_id': row['patch_channel_id'], 'language': row['language']}
                     for row in cursor.fetchall()
-                ]
-        except Exception as e:
-            logger.error(f"Error getting configured servers: {e}")
-            return []
+                }
+        except sqlite3.Error as e:
+            logger.error(f"Error loading server configs: {e}")
+            return {}
+    
+    def get_server_config(self, guild_id: int) -> Optional[Dict[str, Any]]:
+        """Get server configuration"""
+        with self._lock:
+            config = self._server_cache.get(guild_id)
+            return dict(config) if config else None
+    
+    def get_all_configured_servers(self) -> List[Dict[str, Any]]:
+        """Get all servers with patch channels configured"""
+        with self._lock:
+            return [
+                {
+                    'guild_id': guild_id,
+                    'channel_id': config['channel_id'],
+                    'language': config['language'] or 'en'
+                }
+                for guild_id, config in self._server_cache.items()
+                if config['channel_id'] is not None
+            ]
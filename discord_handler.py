@@ -1,20 +1,147 @@
 """Enhanced Discord message posting with new notification pattern"""
 import discord
+import functools
+import itertools
+import re
+from collections import OrderedDict, defaultdict
 import os
 import asyncio
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List, Tuple
 import logging
 from config import Config
+from utils.helpers import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+# Patch ids remembered per channel to skip re-posting the same patch
+_POSTED_PER_CHANNEL = 1024
+
+# Discord's limit on fields in one embed
+_FIELDS_PER_EMBED = 25
+# Discord caps the combined text of an embed at 6000 characters; the rest of this
+# budget is left for the title and description of bulk notifications
+_EMBED_FIELDS_BUDGET = 6000 - 200
+
+# Text after the first "• " of a line, up to the next "• ", skipping lines that mention None
+_BULLET_RE = re.compile(r'^(?!.*None).*?• (.*?)(?:• |$)', re.MULTILINE)
+
+_KOREAN_DATE_RE = re.compile('[년월일]')
+# Title keywords that mark a maintenance notice rather than patch content
+_MAINT_RE = re.compile(r'maintenance|scheduled|server', re.IGNORECASE)
+_MONTH_ABBRS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+def _chunk_report_fields(fields: List[Tuple[str, str, str]]) -> Iterator[List[Tuple[str, str, str]]]:
+    """Split (source, name, value) fields into groups that fit one embed by count and total length"""
+    batch, size = [], 0
+    for field in fields:
+        length = len(field[1]) + len(field[2])
+        if batch and (len(batch) == _FIELDS_PER_EMBED or size + length > _EMBED_FIELDS_BUDGET):
+            yield batch
+            batch, size = [], 0
+        batch.append(field)
+        size += length
+    if batch:
+        yield batch
+
+# Pure functions of patch fields, cached so a broadcast formats each patch once
+@functools.lru_cache(maxsize=256)
+def _ai_heading(summary: str, title: str) -> str:
+    """Generate AI heading from summary"""
+    try:
+        # Extract key changes from AI summary, stopping after the first two
+        key_changes = itertools.islice(
+            (change for change in (m.group(1).strip() for m in _BULLET_RE.finditer(summary)) if len(change) > 5),
+            2
+        )
+        heading = ' & '.join(key_changes)
+        if heading:
+            return heading[:80]
+        
+        # Fallback to original title
+        return title[:80]
+        
+    except Exception as e:
+        logger.error(f"Error generating AI heading: {e}")
+        return title[:80]
+
+@functools.lru_cache(maxsize=256)
+def _format_effect_date(original_date: str) -> str:
+    """Format date to match the requested pattern"""
+    # Try to parse various date formats and convert to desired format
+    if 'UTC' in original_date:
+        return original_date
+    
+    # For Korean dates, try to convert format
+    if _KOREAN_DATE_RE.search(original_date):
+        # Keep original Korean format but add UTC note
+        return f"{original_date} (Check timezone in original notice)"
+    
+    # For other formats, try to standardize
+    if '.' in original_date and len(original_date) > 8:
+        # Assuming YYYY.MM.DD format
+        try:
+            # Only the leading date token; months and days may be unpadded, e.g. "2025.8.6 10:00"
+            parsed = datetime.strptime(original_date.split()[0].rstrip('.'), "%Y.%m.%d")
+            # Month names from a fixed table, since %b follows the process locale
+            return f"{_MONTH_ABBRS[parsed.month - 1]} {parsed.day}, {parsed.year} (UTC)"
+        except ValueError:
+            pass
+    
+    # Fallback - add UTC notation
+    return f"{original_date} (UTC)"
+
+@functools.lru_cache(maxsize=256)
+def _format_ai_summary(summary: str) -> str:
+    """Format AI summary to match your requested pattern"""
+    # If summary is already well-formatted, use as-is
+    if '**' in summary and '•' in summary:
+        return summary[:Config.MAX_DISCORD_FIELD_LENGTH]
+    
+    # Generate structured summary if not available
+    formatted_summary = f"""**🔥 Key Changes:**
+    • {summary[:200]}...
+
+    **⚔️ Class Updates:**
+    • None detected in preview
+
+    **🆕 New Content:**
+    • Check full content for details
+
+    **🔧 Bug Fixes:**
+    • Check full content for details"""
+
+    return formatted_summary[:Config.MAX_DISCORD_FIELD_LENGTH]
+
+def _write_text_file(path: str, text: str):
+    """Write text to a UTF-8 file (blocking; run via asyncio.to_thread)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+def _remove_if_exists(path: str) -> bool:
+    """Delete a file, returning False if it was already gone"""
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
 class DiscordHandler:
     """Enhanced Discord posting with new notification pattern"""
     
     def __init__(self, bot):
         self.bot = bot
         
+        # Discord allows 5 messages per 5s per channel and 50 requests per 10s overall;
+        # staying under both avoids 429s when posting to many servers at once
+        self.rate_limiter = RateLimiter(key_calls=5, key_period=5.0, global_calls=50, global_period=10.0)
+        
+        # Bot avatar URL for embed footers, resolved on ready instead of per embed
+        self._footer_icon: Optional[str] = None
+        
+        # channel id -> patch ids already posted there, oldest first
+        self._posted: Dict[int, "OrderedDict[str, None]"] = defaultdict(OrderedDict)
+        
         # Source-specific configurations
         self.source_configs = {
             "Korean Notice": {
@@ -31,36 +158,93 @@ class DiscordHandler:
             }
         }
     
+    def refresh_footer_icon(self):
+        """Re-read the bot avatar URL used in embed footers"""
+        user = self.bot.user
+        self._footer_icon = user.avatar.url if user and user.avatar else None
+    
+    def _already_posted(self, channel_id: int, patch_id: Optional[str]) -> bool:
+        """Whether this patch was already posted to the channel"""
+        return patch_id is not None and patch_id in self._posted[channel_id]
+    
+    def _mark_posted(self, channel_id: int, patch_id: Optional[str]):
+        """Remember a posted patch, forgetting the oldest beyond the per-channel limit"""
+        if patch_id is None:
+            return
+        posted = self._posted[channel_id]
+        posted[patch_id] = None
+        posted.move_to_end(patch_id)
+        while len(posted) > _POSTED_PER_CHANNEL:
+            posted.popitem(last=False)
+    
+    async def _send_limited(self, channel: discord.abc.Messageable, **kwargs) -> discord.Message:
+        """channel.send gated by the rate limiter, retried once after a 429"""
+        for attempt in range(2):
+            async with self.rate_limiter.acquire(channel.id):
+                try:
+                    return await channel.send(**kwargs)
+                except discord.HTTPException as e:
+                    if e.status != 429 or attempt:
+                        raise
+                    retry_after = float(e.response.headers.get('Retry-After', 1))
+                    logger.warning(f"Rate limited sending to channel {channel.id}, retrying in {retry_after}s")
+                    self.rate_limiter.penalize(retry_after)
+    
+    async def _react_limited(self, message: discord.Message, *emojis: str):
+        """Add reactions through the rate limiter; failures are logged and ignored"""
+        for emoji in emojis:
+            try:
+                async with self.rate_limiter.acquire((message.channel.id, 'reaction')):
+                    await message.add_reaction(emoji)
+            except discord.HTTPException as e:
+                logger.warning(f"Could not add reaction {emoji} in channel {message.channel.id}: {e}")
+                return
+    
     async def post_enhanced_patch(self, channel: discord.TextChannel, patch_data: Dict[str, Any], source: str) -> bool:
         """Post patch with new notification pattern"""
+        patch_id = patch_data.get('id')
+        if self._already_posted(channel.id, patch_id):
+            return True
+        
+        try:
+            embed = self.build_enhanced_embed(patch_data, source)
+        except Exception as e:
+            logger.error(f"Unexpected error posting {source} patch: {e}")
+            return False
+        
+        posted = await self.send_enhanced_embed(channel, embed, source)
+        if posted:
+            self._mark_posted(channel.id, patch_id)
+        return posted
+    
+    def build_enhanced_embed(self, patch_data: Dict[str, Any], source: str, now: Optional[datetime] = None) -> discord.Embed:
+        """Build the patch notification embed; it can be sent to any number of channels"""
+        # Get source configuration
+        source_config = self.source_configs.get(source, {
+            "color": 0x0099FF,
+            "icon": "📰",
+            "flag": "??",
+            "title_prefix": "New BDO Update"
+        })
+        
+        # Generate AI heading if available, otherwise use original title
+        if patch_data.get('summary'):
+            # Extract key points for heading
+            ai_heading = self._generate_ai_heading(patch_data)
+        else:
+            ai_heading = patch_data.get('title', 'Patch Update')[:100]
+        
+        # Create the new notification pattern
+        return self._create_new_pattern_embed(patch_data, source, source_config, ai_heading, now)
+    
+    async def send_enhanced_embed(self, channel: discord.TextChannel, embed: discord.Embed, source: str) -> bool:
+        """Send a prebuilt patch embed to one channel and add the usual reactions"""
         try:
-            # Get source configuration
-            source_config = self.source_configs.get(source, {
-                "color": 0x0099FF,
-                "icon": "📰",
-                "flag": "??",
-                "title_prefix": "New BDO Update"
-            })
-            
-            # Generate AI heading if available, otherwise use original title
-            if patch_data.get('summary'):
-                # Extract key points for heading
-                ai_heading = await self._generate_ai_heading(patch_data)
-            else:
-                ai_heading = patch_data.get('title', 'Patch Update')[:100]
-            
-            # Create the new notification pattern
-            embed = await self._create_new_pattern_embed(patch_data, source, source_config, ai_heading)
-            
             # Send the notification
-            message = await channel.send(embed=embed)
+            message = await self._send_limited(channel, embed=embed)
             
             # Add reactions
-            try:
-                await message.add_reaction("🔥")
-                await message.add_reaction("👀")
-            except:
-                pass
+            await self._react_limited(message, "🔥", "👀")
             
             logger.info(f"Successfully posted {source} patch with new pattern to channel {channel.id}")
             return True
@@ -75,44 +259,18 @@ class DiscordHandler:
             logger.error(f"Unexpected error posting {source} patch: {e}")
             return False
     
-    async def _generate_ai_heading(self, patch_data: Dict[str, Any]) -> str:
+    def _generate_ai_heading(self, patch_data: Dict[str, Any]) -> str:
         """Generate AI heading from summary"""
-        try:
-            summary = patch_data.get('summary', '')
-            
-            # Extract key changes from AI summary
-            if '• ' in summary:
-                lines = summary.split('\n')
-                key_changes = []
-                
-                for line in lines:
-                    if '• ' in line and 'None' not in line:
-                        # Clean up the bullet point
-                        change = line.split('• ')[1].strip() if '• ' in line else line.strip()
-                        if change and len(change) > 5:
-                            key_changes.append(change)
-                
-                if key_changes:
-                    # Take first 2-3 key changes for heading
-                    heading_parts = key_changes[:2]
-                    return ' & '.join(heading_parts)[:80]
-            
-            # Fallback to original title
-            return patch_data.get('title', 'Patch Update')[:80]
-            
-        except Exception as e:
-            logger.error(f"Error generating AI heading: {e}")
-            return patch_data.get('title', 'Patch Update')[:80]
+        return _ai_heading(patch_data.get('summary', ''), patch_data.get('title', 'Patch Update'))
     
-    async def _create_new_pattern_embed(self, patch_data: Dict[str, Any], source: str, source_config: Dict[str, Any], ai_heading: str) -> discord.Embed:
+    def _create_new_pattern_embed(self, patch_data: Dict[str, Any], source: str, source_config: Dict[str, Any], ai_heading: str, now: Optional[datetime] = None) -> discord.Embed:
         """Create embed with enhanced content handling"""
         
         # Main title
         title = source_config['title_prefix']
         
         # Check if this is a maintenance notice vs actual patch content
-        is_maintenance = any(keyword in patch_data.get('title', '').lower() 
-                            for keyword in ['maintenance', 'scheduled', 'server'])
+        is_maintenance = bool(_MAINT_RE.search(patch_data.get('title') or ''))
         
         # Format description
         if is_maintenance:
@@ -120,129 +278,59 @@ class DiscordHandler:
         else:
             description = f"**{ai_heading}**"
         
-        # Create embed
-        embed = discord.Embed(
-            title=title,
-            description=description,
-            color=source_config['color'],
-            timestamp=datetime.now(timezone.utc)
-        )
-        
         # Add effect date
         effect_date = self._format_effect_date(patch_data.get('date', 'Unknown'))
-        embed.add_field(
-            name="📅 Effect on Date",
-            value=effect_date,
-            inline=False
-        )
+        fields = [{"name": "📅 Effect on Date", "value": effect_date, "inline": False}]
         
         # Add original link
         patch_link = patch_data.get('link')
         if patch_link and patch_link.startswith('http'):
-            embed.add_field(
-                name="🔗 Original Link",
-                value=f"[View Official Notice]({patch_link})",
-                inline=False
-            )
+            fields.append({"name": "🔗 Original Link", "value": f"[View Official Notice]({patch_link})", "inline": False})
         
         # Add separator
-        embed.add_field(
-            name="━━━━━━━━━━━━━━━━━━━━━━━━━━",
-            value="** **",
-            inline=False
-        )
+        fields.append({"name": "━━━━━━━━━━━━━━━━━━━━━━━━━━", "value": "** **", "inline": False})
         
         # Enhanced AI Summary handling
         if patch_data.get('summary'):
             formatted_summary = self._format_ai_summary(patch_data['summary'])
-            embed.add_field(
-                name="🤖 AI Summary",
-                value=formatted_summary,
-                inline=False
-            )
+            fields.append({"name": "🤖 AI Summary", "value": formatted_summary, "inline": False})
         elif is_maintenance:
             # Special handling for maintenance notices
-            embed.add_field(
-                name="🔧 Maintenance Information",
-                value="**📋 Details:**\n• Server maintenance scheduled\n• Services temporarily unavailable\n• Check official notice for exact times\n\n**🕐 Duration:**\n• Refer to official notice for maintenance window",
-                inline=False
-            )
+            fields.append({
+                "name": "🔧 Maintenance Information",
+                "value": "**📋 Details:**\n• Server maintenance scheduled\n• Services temporarily unavailable\n• Check official notice for exact times\n\n**🕐 Duration:**\n• Refer to official notice for maintenance window",
+                "inline": False
+            })
         else:
             # Content patch without summary - attempt to generate one
-            embed.add_field(
-                name="🤖 AI Summary",
-                value="**📋 Summary:**\n• AI summary generation in progress\n• Check original link for full details\n\n**⚠️ Note:**\n• Summary may be updated once processing completes",
-                inline=False
-            )
+            fields.append({
+                "name": "🤖 AI Summary",
+                "value": "**📋 Summary:**\n• AI summary generation in progress\n• Check original link for full details\n\n**⚠️ Note:**\n• Summary may be updated once processing completes",
+                "inline": False
+            })
         
         # Footer
-        embed.set_footer(
-            text=f"Source: {source} • BDO Patch Bot",
-            icon_url=self.bot.user.avatar.url if self.bot.user.avatar else None
-        )
+        footer = {"text": f"Source: {source} • BDO Patch Bot"}
+        if self._footer_icon:
+            footer["icon_url"] = self._footer_icon
         
-        return embed
+        # Build the whole embed in one go instead of add_field per field
+        return discord.Embed.from_dict({
+            "title": title,
+            "description": description,
+            "color": source_config['color'],
+            "timestamp": (now or datetime.now(timezone.utc)).isoformat(),
+            "fields": fields,
+            "footer": footer
+        })
 
     def _format_effect_date(self, original_date: str) -> str:
         """Format date to match the requested pattern"""
-        try:
-            # Try to parse various date formats and convert to desired format
-            if 'UTC' in original_date:
-                return original_date
-            
-            # For Korean dates, try to convert format
-            if any(char in original_date for char in ['년', '월', '일']):
-                # Keep original Korean format but add UTC note
-                return f"{original_date} (Check timezone in original notice)"
-            
-            # For other formats, try to standardize
-            if '.' in original_date and len(original_date) > 8:
-                # Assuming YYYY.MM.DD format
-                parts = original_date.split('.')
-                if len(parts) >= 3:
-                    try:
-                        year, month, day = parts[0], parts[1], parts[2][:2]
-                        # Convert to readable format
-                        months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
-                                'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-                        month_name = months[int(month) - 1] if int(month) <= 12 else month
-                        return f"{month_name} {int(day)}, {year} (UTC)"
-                    except:
-                        pass
-            
-            # Fallback - add UTC notation
-            return f"{original_date} (UTC)"
-            
-        except Exception as e:
-            logger.error(f"Error formatting date: {e}")
-            return f"{original_date} (UTC)"
+        return _format_effect_date(original_date)
     
     def _format_ai_summary(self, summary: str) -> str:
         """Format AI summary to match your requested pattern"""
-        try:
-            # If summary is already well-formatted, use as-is
-            if '**' in summary and '•' in summary:
-                return summary[:Config.MAX_DISCORD_FIELD_LENGTH]
-            
-            # Generate structured summary if not available
-            formatted_summary = f"""**🔥 Key Changes:**
-    • {summary[:200]}...
-
-    **⚔️ Class Updates:**
-    • None detected in preview
-
-    **🆕 New Content:**
-    • Check full content for details
-
-    **🔧 Bug Fixes:**
-    • Check full content for details"""
-
-            return formatted_summary[:Config.MAX_DISCORD_FIELD_LENGTH]
-            
-        except Exception as e:
-            logger.error(f"Error formatting AI summary: {e}")
-            return summary[:Config.MAX_DISCORD_FIELD_LENGTH] if summary else "Summary not available"
-
+        return _format_ai_summary(summary)
     
     # Legacy and utility methods
     
@@ -252,41 +340,63 @@ class DiscordHandler:
             # Try to determine source from patch data
             source = patch_data.get('source', 'Korean Notice')
             
-            # Get configured servers and post to all
-            from database import BotDatabase
-            db = BotDatabase()
-            configured_servers = db.get_all_configured_servers()
+            # Get configured servers and resolve their channels once
+            configured_servers = self.bot.db.get_all_configured_servers()
+            channels = [self.bot.get_channel(server_config['channel_id']) for server_config in configured_servers]
+            channels = [channel for channel in channels if channel]
+            
+            # Skip channels that already have this patch, e.g. when a poll is retried
+            patch_id = patch_data.get('id')
+            pending = [channel for channel in channels if not self._already_posted(channel.id, patch_id)]
+            if channels and not pending:
+                return True
+            
+            # The embed is identical for every server, so build it once
+            embed = self.build_enhanced_embed(patch_data, source)
+            
+            # Post to servers concurrently; the semaphore bounds in-flight sends and the
+            # rate limiter keeps the burst inside Discord's buckets
+            semaphore = asyncio.Semaphore(10)
+            results = await asyncio.gather(
+                *(self._post_one(semaphore, channel, embed, source) for channel in pending),
+                return_exceptions=True
+            )
             
             success_count = 0
-            for server_config in configured_servers:
-                channel = self.bot.get_channel(server_config['channel_id'])
-                if channel:
-                    if await self.post_enhanced_patch(channel, patch_data, source):
-                        success_count += 1
+            for channel, result in zip(pending, results):
+                if result is True:
+                    self._mark_posted(channel.id, patch_id)
+                    success_count += 1
             
-            return success_count > 0
+            return success_count > 0 or len(pending) < len(channels)
             
         except Exception as e:
             logger.error(f"Error in legacy post method: {e}")
             return False
     
-    def create_info_embed(self, title: str, description: str, color: int = 0x00ff00) -> discord.Embed:
+    async def _post_one(self, semaphore: asyncio.Semaphore, channel: discord.TextChannel,
+                        embed: discord.Embed, source: str) -> bool:
+        """Send a prebuilt patch embed to one configured server's channel"""
+        async with semaphore:
+            return await self.send_enhanced_embed(channel, embed, source)
+    
+    def create_info_embed(self, title: str, description: str, color: int = 0x00ff00, now: Optional[datetime] = None) -> discord.Embed:
         """Create a simple info embed"""
         embed = discord.Embed(
             title=title,
             description=description[:2048],
             color=color,
-            timestamp=datetime.now()
+            timestamp=now or datetime.now(timezone.utc)
         )
-        embed.set_footer(text="BDO Patch Bot", icon_url=self.bot.user.avatar.url if self.bot.user.avatar else None)
+        embed.set_footer(text="BDO Patch Bot", icon_url=self._footer_icon)
         return embed
     
-    def create_debug_embed(self, debug_info: Dict[str, Any]) -> discord.Embed:
+    def create_debug_embed(self, debug_info: Dict[str, Any], now: Optional[datetime] = None) -> discord.Embed:
         """Create debug information embed"""
         embed = discord.Embed(
             title="🔧 Debug Information",
             color=0xFFAA00,
-            timestamp=datetime.now()
+            timestamp=now or datetime.now(timezone.utc)
         )
         
         # Add debug fields
@@ -312,24 +422,24 @@ class DiscordHandler:
         embed.set_footer(text="Debug Mode • BDO Patch Bot")
         return embed
     
-    def create_error_embed(self, error_title: str, error_message: str) -> discord.Embed:
+    def create_error_embed(self, error_title: str, error_message: str, now: Optional[datetime] = None) -> discord.Embed:
         """Create an error embed"""
         embed = discord.Embed(
             title=f"❌ {error_title}",
             description=error_message[:2048],
             color=0xFF0000,
-            timestamp=datetime.now()
+            timestamp=now or datetime.now(timezone.utc)
         )
         embed.set_footer(text="BDO Patch Bot")
         return embed
     
-    def create_success_embed(self, success_title: str, success_message: str) -> discord.Embed:
+    def create_success_embed(self, success_title: str, success_message: str, now: Optional[datetime] = None) -> discord.Embed:
         """Create a success embed"""
         embed = discord.Embed(
             title=f"✅ {success_title}",
             description=success_message[:2048],
             color=0x00FF00,
-            timestamp=datetime.now()
+            timestamp=now or datetime.now(timezone.utc)
         )
         embed.set_footer(text="BDO Patch Bot")
         return embed
@@ -343,11 +453,11 @@ class DiscordHandler:
                 return False
             
             if embed and content:
-                await channel.send(content=content, embed=embed)
+                await self._send_limited(channel, content=content, embed=embed)
             elif embed:
-                await channel.send(embed=embed)
+                await self._send_limited(channel, embed=embed)
             elif content:
-                await channel.send(content=content)
+                await self._send_limited(channel, content=content)
             else:
                 logger.error("No content or embed provided to send")
                 return False
@@ -364,13 +474,16 @@ class DiscordHandler:
         safe_source = source.lower().replace(" ", "_").replace("-", "_")
         filename = f"bdo_{safe_source}_{content_type}_{timestamp}.txt"
         
+        body = (
+            f"BDO {source} - {content_type.title()}\n"
+            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            + "=" * 60 + "\n\n"
+            + content
+        )
+        
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(f"BDO {source} - {content_type.title()}\n")
-                f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write("=" * 60 + "\n\n")
-                f.write(content)
-                
+            # File I/O runs in a worker thread so concurrent sends are not stalled
+            await asyncio.to_thread(_write_text_file, filename, body)
             return filename
             
         except Exception as e:
@@ -381,52 +494,11 @@ class DiscordHandler:
         """Safely clean up temporary files"""
         try:
             await asyncio.sleep(1)
-            if os.path.exists(filename):
-                os.remove(filename)
+            if await asyncio.to_thread(_remove_if_exists, filename):
                 logger.debug(f"Cleaned up file: {filename}")
         except Exception as e:
             logger.warning(f"Could not clean up file {filename}: {e}")
     
-    def create_info_embed(self, title: str, description: str, color: int = 0x00ff00) -> discord.Embed:
-        """Create a simple info embed"""
-        embed = discord.Embed(
-            title=title,
-            description=description[:2048],
-            color=color,
-            timestamp=datetime.now()
-        )
-        embed.set_footer(text="BDO Patch Bot", icon_url=self.bot.user.avatar.url if self.bot.user.avatar else None)
-        return embed
-    
-    def create_debug_embed(self, debug_info: Dict[str, Any]) -> discord.Embed:
-        """Create debug information embed"""
-        embed = discord.Embed(
-            title="🔧 Debug Information",
-            color=0xFFAA00,
-            timestamp=datetime.now()
-        )
-        
-        for key, value in debug_info.items():
-            if key != 'error':
-                field_name = key.replace('_', ' ').title()
-                field_value = str(value)[:Config.MAX_DISCORD_FIELD_LENGTH]
-                embed.add_field(
-                    name=field_name,
-                    value=field_value,
-                    inline=True
-                )
-        
-        if 'error' in debug_info:
-            error_text = str(debug_info['error'])[:Config.MAX_DISCORD_FIELD_LENGTH]
-            embed.add_field(
-                name="❌ Error",
-                value=f"``````",
-                inline=False
-            )
-        
-        embed.set_footer(text="Debug Mode • BDO Patch Bot")
-        return embed
-    
     async def notify_new_ai_report(self, channel: discord.TextChannel, report_data: Dict[str, Any]) -> bool:
         """Notify about new AI report"""
         try:
@@ -449,13 +521,52 @@ class DiscordHandler:
             
             embed.set_footer(text=f"Intelligence Report: {report_filename}")
             
-            message = await channel.send(embed=embed)
+            message = await self._send_limited(channel, embed=embed)
             
             # Add reaction
-            await message.add_reaction("📊")
+            await self._react_limited(message, "📊")
             
             return True
             
         except Exception as e:
             logger.error(f"Error notifying about AI report: {e}")
             return False
+    
+    async def notify_bulk_reports(self, channel: discord.TextChannel, reports: List[Dict[str, Any]]) -> bool:
+        """Notify about several new AI reports, splitting them over embeds that fit Discord's limits"""
+        if len(reports) == 1:
+            return await self.notify_new_ai_report(channel, reports[0])
+        
+        try:
+            now = datetime.now(timezone.utc)
+            fields = [
+                (report['source'],
+                 f"📊 {report['source']}: {report['title'][:100]}",
+                 f"Use `!latest {report['source'].split()[0].lower()}` to download\nReport: {report['report_filename']}"[:Config.MAX_DISCORD_FIELD_LENGTH])
+                for report in reports
+            ]
+            for batch in _chunk_report_fields(fields):
+                sources = {source for source, _, _ in batch}
+                if len(sources) == 1:
+                    color = 0x00ff88 if 'Global' in next(iter(sources)) else 0xff6b35
+                else:
+                    color = 0x0099ff  # Mixed sources
+                
+                embed = discord.Embed(
+                    title=f"🆕 {len(batch)} New Analyses Available",
+                    description="Comprehensive analyses now available",
+                    color=color,
+                    timestamp=now
+                )
+                
+                for _, name, value in batch:
+                    embed.add_field(name=name, value=value, inline=False)
+                
+                message = await self._send_limited(channel, embed=embed)
+                await self._react_limited(message, "📊")
+            
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error notifying about AI reports: {e}")
+            return False
@@ -1,91 +1,97 @@
 """Link extractor for BDO patch pages - gets links only, not content"""
 import aiohttp
 from bs4 import BeautifulSoup
-from typing import List, Dict, Any, Optional
+from typing import Any, Callable, Dict, List, Optional
 import logging
 import re
 import hashlib
-import time
+from urllib.parse import urljoin
 
 logger = logging.getLogger(__name__)
 
+# Compiled once; one alternation so each element's text is scanned a single time
+_DATE_ANY = re.compile(
+    r'(\d{4}-\d{2}-\d{2}'
+    r'|\d{4}\.\d{2}\.\d{2}'
+    r'|\d{2}/\d{2}/\d{4}'
+    r'|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},?\s+\d{4})'
+)
+# Relative links on each listing page resolve against these
+_GL_BASE = "https://blackdesert.pearlabyss.com/GlobalLab/"
+_KR_BASE = "https://www.kr.playblackdesert.com/ko-KR/News/"
+
+# Tried in order; the first selector that matches anything wins
+_SELECTORS = (
+    'li:has(a[href*="Detail"])',
+    'tr:has(a[href*="Detail"])',
+    'a[href*="Detail"]'
+)
+_BOARD_RE = re.compile(r'[?&]_?boardNo=(\d+)', re.IGNORECASE)
+_GROUP_RE = re.compile(r'[?&]groupContentNo=(\d+)', re.IGNORECASE)
+
 class BDOLinkExtractor:
     """Extract patch links for AI processing"""
     
     def __init__(self):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            # aiohttp decompresses these itself; 'br' would need the optional Brotli package
+            'Accept-Encoding': 'gzip, deflate',
         }
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Shared session, so repeated polls reuse DNS results and keep-alive connections"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit_per_host=4, ttl_dns_cache=300, keepalive_timeout=60)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
     
     async def extract_global_lab_links(self, base_url: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Extract Global Labs patch links"""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(base_url, headers=self.headers) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-                        
-                        patches = []
-                        selectors = [
-                            'li:has(a[href*="Detail"])',
-                            'tr:has(a[href*="Detail"])',
-                            'a[href*="Detail"]'
-                        ]
-                        
-                        for selector in selectors:
-                            elements = soup.select(selector)[:limit * 2]
-                            if elements:
-                                logger.info(f"Found {len(elements)} Global Labs links")
-                                
-                                for element in elements:
-                                    patch_data = self._extract_global_lab_link_data(element, base_url)
-                                    if patch_data:
-                                        patches.append(patch_data)
-                                    if len(patches) >= limit:
-                                        break
-                                break
-                        
-                        return patches[:limit]
-                        
-        except Exception as e:
-            logger.error(f"Error extracting Global Labs links: {e}")
-        
-        return []
+        return await self._extract_links(base_url, limit, "Global Labs", self._extract_global_lab_link_data)
     
     async def extract_korean_links(self, base_url: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Extract Korean patch links"""
+        return await self._extract_links(base_url, limit, "Korean", self._extract_korean_link_data)
+    
+    async def _extract_links(self, base_url: str, limit: int, name: str,
+                             handler: Callable[[Any, str], Optional[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Fetch a listing page and turn its patch links into patch data with handler"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(base_url, headers=self.headers) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-                        
-                        patches = []
-                        selectors = [
-                            'li:has(a[href*="Detail"])',
-                            'tr:has(a[href*="Detail"])',
-                            'a[href*="Detail"]'
-                        ]
-                        
-                        for selector in selectors:
-                            elements = soup.select(selector)[:limit * 2]
-                            if elements:
-                                logger.info(f"Found {len(elements)} Korean links")
-                                
-                                for element in elements:
-                                    patch_data = self._extract_korean_link_data(element, base_url)
-                                    if patch_data:
-                                        patches.append(patch_data)
-                                    if len(patches) >= limit:
-                                        break
-                                break
-                        
-                        return patches[:limit]
-                        
+            session = await self._get_session()
+            async with session.get(base_url) as response:
+                if response.status == 200:
+                    # BeautifulSoup decodes the bytes itself: the declared charset is tried first and
+                    # the page's meta tag or detection covers a missing or unknown one
+                    raw = await response.read()
+                    soup = BeautifulSoup(raw, 'lxml', from_encoding=response.charset)
+                    
+                    patches = []
+                    for selector in _SELECTORS:
+                        elements = soup.select(selector, limit=limit * 2)
+                        if elements:
+                            logger.info(f"Found {len(elements)} {name} links")
+                            
+                            for element in elements:
+                                patch_data = handler(element, base_url)
+                                if patch_data:
+                                    patches.append(patch_data)
+                                if len(patches) >= limit:
+                                    break
+                            break
+                    
+                    return patches[:limit]
+                    
         except Exception as e:
-            logger.error(f"Error extracting Korean links: {e}")
+            logger.error(f"Error extracting {name} links: {e}")
         
         return []
     
@@ -102,12 +108,7 @@ class BDOLinkExtractor:
                 return None
             
             # Build full URL
-            if href.startswith('http'):
-                full_url = href
-            elif href.startswith('/'):
-                full_url = f"https://blackdesert.pearlabyss.com{href}"
-            else:
-                full_url = f"https://blackdesert.pearlabyss.com/GlobalLab/{href}"
+            full_url = urljoin(_GL_BASE, href)
             
             # Extract title
             title = link_elem.get_text(strip=True)
@@ -129,7 +130,8 @@ class BDOLinkExtractor:
                 'language': 'english'
             }
             
-        except Exception as e:
+        except (AttributeError, TypeError, ValueError) as e:
+            # Unexpected markup, e.g. a multi-valued href or a malformed URL
             logger.error(f"Error extracting Global Labs link data: {e}")
             return None
     
@@ -146,12 +148,7 @@ class BDOLinkExtractor:
                 return None
             
             # Build full URL
-            if href.startswith('http'):
-                full_url = href
-            elif href.startswith('/'):
-                full_url = f"https://www.kr.playblackdesert.com{href}"
-            else:
-                full_url = f"https://www.kr.playblackdesert.com/ko-KR/News/{href}"
+            full_url = urljoin(_KR_BASE, href)
             
             # Extract title
             title = link_elem.get_text(strip=True)
@@ -173,50 +170,27 @@ class BDOLinkExtractor:
                 'language': 'korean'
             }
             
-        except Exception as e:
+        except (AttributeError, TypeError, ValueError) as e:
             logger.error(f"Error extracting Korean link data: {e}")
             return None
     
     def _generate_stable_id(self, url: str, source: str) -> str:
         """Generate stable ID from URL"""
-        try:
-            # Extract board number from URL
-            board_match = re.search(r'[?&]_?boardNo=(\d+)', url, re.IGNORECASE)
-            if board_match:
-                return f"{source}_{board_match.group(1)}"
-            
-            # Extract group content number
-            group_match = re.search(r'[?&]groupContentNo=(\d+)', url, re.IGNORECASE)
-            if group_match:
-                return f"{source}_{group_match.group(1)}"
-            
-            # Fallback to URL hash
-            url_hash = hashlib.md5(url.encode()).hexdigest()[:12]
-            return f"{source}_url_{url_hash}"
-            
-        except Exception as e:
-            logger.error(f"Error generating stable ID: {e}")
-            return f"{source}_error_{int(time.time())}"
+        # Extract board number from URL
+        board_match = _BOARD_RE.search(url)
+        if board_match:
+            return f"{source}_{board_match.group(1)}"
+        
+        # Extract group content number
+        group_match = _GROUP_RE.search(url)
+        if group_match:
+            return f"{source}_{group_match.group(1)}"
+        
+        # Fallback to URL hash
+        url_hash = hashlib.md5(url.encode()).hexdigest()[:12]
+        return f"{source}_url_{url_hash}"
     
     def _extract_date_from_element(self, element) -> Optional[str]:
         """Extract date from element context"""
-        try:
-            text = element.get_text()
-            
-            # Date patterns
-            patterns = [
-                r'(\d{4}-\d{2}-\d{2})',
-                r'(\d{4}\.\d{2}\.\d{2})',
-                r'(\d{2}/\d{2}/\d{4})',
-                r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},?\s+\d{4})'
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, text)
-                if match:
-                    return match.group(1)
-                    
-        except Exception as e:
-            logger.error(f"Error extracting date: {e}")
-        
-        return None
+        match = _DATE_ANY.search(element.get_text())
+        return match.group(1) if match else None
@@ -5,6 +5,7 @@ import logging
 import asyncio
 import sys
 import os
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
 
 # Set UTF-8 encoding before any other imports
 os.environ['PYTHONIOENCODING'] = 'utf-8'
@@ -24,6 +25,12 @@ from utils.helpers import setup_logging, safe_log_message
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# New patches waiting for a report worker; producers pause when it is full
+_ANALYSIS_QUEUE_SIZE = 16
+
+# Delay before a failed notification pass is retried
+_NOTIFICATION_RETRY_SECONDS = 120
+
 class EnhancedBDOPatchBot(commands.Bot):
     """Enhanced bot with AI analysis workflow"""
     
@@ -34,9 +41,21 @@ class EnhancedBDOPatchBot(commands.Bot):
         
         # Initialize components
         self.link_extractor = BDOLinkExtractor()
-        self.ai_analyzer = BDOAIAnalyzer(Config.GEMINI_API_KEY)
-        self.discord_handler = DiscordHandler(self)
         self.db = BotDatabase()
+        self.ai_analyzer = BDOAIAnalyzer(Config.GEMINI_API_KEY, self.db)
+        self.discord_handler = DiscordHandler(self)
+        
+        # Patch ids that already have a report, so each cycle only asks the DB about unseen ones
+        self._seen_patch_ids = {
+            source: set(self.db.get_all_ids(source)) for source in ('Global Labs', 'Korean Notice')
+        }
+        
+        # Set whenever reports are stored; the notification task sleeps until then.
+        # Starts set so reports left unnotified by a previous run go out on startup
+        self._new_report_event = asyncio.Event()
+        self._new_report_event.set()
+        self._notification_task: Optional[asyncio.Task] = None
+        self._command_names: Tuple[str, ...] = ()
     
     async def setup_hook(self):
         """Setup hook for loading extensions"""
@@ -46,12 +65,8 @@ class EnhancedBDOPatchBot(commands.Bot):
             await self.load_extension('commands.config_commands')
             logger.info("All extensions loaded successfully")
             
-            # Print loaded commands for debugging
-            command_names = [cmd.name for cmd in self.commands]
-            logger.info(f"Loaded commands: {command_names}")
-            
         except Exception as e:
-            logger.error(f"Failed to load extensions: {e}")
+            logger.error("Failed to load extensions: %s", e)
             # Manual fallback loading
             try:
                 from commands.patch_commands import PatchCommands
@@ -60,16 +75,31 @@ class EnhancedBDOPatchBot(commands.Bot):
                 await self.add_cog(ConfigCommands(self))
                 logger.info("Manually loaded cogs as fallback")
             except Exception as fallback_error:
-                logger.error(f"Fallback cog loading failed: {fallback_error}")
+                logger.error("Fallback cog loading failed: %s", fallback_error)
+        
+        # Commands don't change after loading, so list them once instead of on every ready
+        self._command_names = tuple(cmd.name for cmd in self.commands)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Loaded commands: %s", list(self._command_names))
+    
+    async def close(self):
+        """Shut down the bot and release the HTTP session and database connection"""
+        if self._notification_task:
+            self._notification_task.cancel()
+        await super().close()
+        await self.link_extractor.close()
+        self.db.close()
     
     async def on_ready(self):
         """Bot ready event"""
-        logger.info(f'{self.user} has logged in!')
-        logger.info(f'Bot is monitoring {len(self.guilds)} servers')
+        logger.info('%s has logged in!', self.user)
+        logger.info('Bot is monitoring %s servers', len(self.guilds))
+        
+        self.discord_handler.refresh_footer_icon()
         
         # Print available commands for debugging
-        command_names = [cmd.name for cmd in self.commands]
-        logger.info(f"Available commands: {command_names}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Available commands: %s", list(self._command_names))
         
         # Start AI analysis monitoring
         if not self.ai_analysis_loop.is_running():
@@ -77,88 +107,137 @@ class EnhancedBDOPatchBot(commands.Bot):
             logger.info("Started AI analysis monitoring loop")
         
         # Start notification loop
-        if not self.notification_loop.is_running():
-            self.notification_loop.start()
+        if self._notification_task is None or self._notification_task.done():
+            self._notification_task = asyncio.create_task(self.notification_loop())
             logger.info("Started notification loop")
     
+    def wake_notifications(self):
+        """Tell the notification loop that new unnotified reports were stored"""
+        self._new_report_event.set()
+    
+    def _invalidate_report_caches(self, source: str):
+        """Drop cached report lookups for a source once a new report is stored"""
+        patch_commands = self.get_cog('PatchCommands')
+        if patch_commands:
+            patch_commands.invalidate(source)
+    
     @tasks.loop(minutes=Config.CHECK_INTERVAL_MINUTES)
     async def ai_analysis_loop(self):
         """Main AI analysis loop - generates reports for new patches"""
         try:
             logger.info("Running AI analysis cycle...")
             
-            # Extract Global Labs links
-            gl_patches = await self.link_extractor.extract_global_lab_links(
-                Config.GLOBAL_LAB_URL, 5
-            )
-            
-            # Process Global Labs patches
-            for patch in gl_patches:
-                if self.db.is_report_new('Global Labs', patch['id']):
-                    # Safe logging for Korean titles
-                    safe_title = safe_log_message(patch['title'][:50])
-                    logger.info(f"Generating new AI report for Global Labs: {safe_title}...")
-                    
-                    report_filename = await self.ai_analyzer.generate_deep_report(patch)
-                    if report_filename:
-                        self.db.store_ai_report(patch, report_filename, 'Global Labs')
-                        logger.info(f"New Global Labs AI report generated: {report_filename}")
-            
-            # Extract Korean links
-            kr_patches = await self.link_extractor.extract_korean_links(
-                Config.KOREAN_NOTICE_URL, 5
-            )
-            
-            # Process Korean patches
-            for patch in kr_patches:
-                if self.db.is_report_new('Korean Notice', patch['id']):
-                    # Safe logging for Korean titles
-                    safe_title = safe_log_message(patch['title'][:50])
-                    logger.info(f"Generating new AI report for Korean: {safe_title}...")
-                    
-                    report_filename = await self.ai_analyzer.generate_deep_report(patch)
-                    if report_filename:
-                        self.db.store_ai_report(patch, report_filename, 'Korean Notice')
-                        logger.info(f"New Korean AI report generated: {report_filename}")
+            # Each listing feeds new patches into a bounded queue as soon as it is parsed,
+            # so report generation starts without waiting for the slower site
+            queue: asyncio.Queue = asyncio.Queue(maxsize=_ANALYSIS_QUEUE_SIZE)
+            workers = [
+                asyncio.create_task(self._analysis_worker(queue))
+                for _ in range(Config.MAX_CONCURRENT_ANALYSES)
+            ]
+            try:
+                # A failing listing must not stop the other source's patches from being analysed
+                results = await asyncio.gather(
+                    self._queue_new_patches(queue, 'Global Labs',
+                                            self.link_extractor.extract_global_lab_links(Config.GLOBAL_LAB_URL, 5)),
+                    self._queue_new_patches(queue, 'Korean Notice',
+                                            self.link_extractor.extract_korean_links(Config.KOREAN_NOTICE_URL, 5)),
+                    return_exceptions=True
+                )
+                for result in results:
+                    if isinstance(result, Exception):
+                        logger.error("Error fetching patch listing: %s", result)
+                await queue.join()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
             
         except Exception as e:
-            logger.error(f"Error in AI analysis loop: {e}")
+            logger.error("Error in AI analysis loop: %s", e)
+    
+    async def _queue_new_patches(self, queue: asyncio.Queue, source: str,
+                                 listing: Awaitable[List[Dict[str, Any]]]):
+        """Await a source's listing and queue the patches that don't have a report yet"""
+        seen = self._seen_patch_ids[source]
+        unseen = [patch for patch in await listing if patch['id'] not in seen]
+        if not unseen:
+            return
+        
+        # One query for the whole listing instead of one per patch
+        new_ids = await asyncio.to_thread(self.db.filter_new_ids, source, [patch['id'] for patch in unseen])
+        for patch in unseen:
+            if patch['id'] not in new_ids:
+                seen.add(patch['id'])  # Stored outside this loop, e.g. by a command
+            else:
+                if logger.isEnabledFor(logging.INFO):
+                    # Safe logging for Korean titles
+                    logger.info("Generating new AI report for %s: %s...", source, safe_log_message(patch['title'][:50]))
+                await queue.put((source, patch))
+    
+    async def _analysis_worker(self, queue: asyncio.Queue):
+        """Generate and store reports for queued patches until cancelled"""
+        while True:
+            source, patch = await queue.get()
+            try:
+                report_filename = await self.ai_analyzer.generate_deep_report(patch)
+                if report_filename:
+                    logger.info("New %s AI report generated: %s", source, report_filename)
+                    # Stored right away so its notification doesn't wait for the rest of the cycle;
+                    # INSERT OR IGNORE skips patches stored meanwhile
+                    if await asyncio.to_thread(self.db.store_ai_reports_bulk, [(patch, report_filename)], source):
+                        self._invalidate_report_caches(source)
+                        self.wake_notifications()
+                        self._seen_patch_ids[source].add(patch['id'])
+            except Exception as e:
+                logger.error("Error generating report for %s: %s", patch.get('id'), e)
+            finally:
+                queue.task_done()
     
-    @tasks.loop(minutes=2)
     async def notification_loop(self):
-        """Send notifications for new AI reports"""
-        try:
-            # Get unnotified reports
-            unnotified_reports = self.db.get_unnotified_reports()
+        """Send notifications for new AI reports as soon as they are stored"""
+        while not self.is_closed():
+            await self._new_report_event.wait()
+            self._new_report_event.clear()
             
-            if unnotified_reports:
-                # Get configured servers
-                configured_servers = self.db.get_all_configured_servers()
+            try:
+                # Get unnotified reports
+                unnotified_reports = await asyncio.to_thread(self.db.get_unnotified_reports)
+            
+                if unnotified_reports:
+                    # Get configured servers (served from the in-memory config cache)
+                    configured_servers = self.db.get_all_configured_servers()
                 
-                for report in unnotified_reports:
+                    # One message per channel for the whole batch instead of one per report
                     for server_config in configured_servers:
                         try:
                             channel = self.get_channel(server_config['channel_id'])
                             if channel:
-                                await self.discord_handler.notify_new_ai_report(
-                                    channel, report
-                                )
+                                await self.discord_handler.notify_bulk_reports(channel, unnotified_reports)
                         except Exception as e:
-                            logger.error(f"Error notifying server: {e}")
-                    
+                            logger.error("Error notifying server: %s", e)
+                
                     # Mark as notified
-                    self.db.mark_report_notified(report['source'], report['patch_id'])
+                    await asyncio.to_thread(
+                        self.db.mark_reports_notified,
+                        [(report['source'], report['patch_id']) for report in unnotified_reports]
+                    )
                     
-        except Exception as e:
-            logger.error(f"Error in notification loop: {e}")
+            except Exception as e:
+                logger.error("Error in notification loop: %s", e)
+                # Retry later rather than waiting for the next stored report
+                await asyncio.sleep(_NOTIFICATION_RETRY_SECONDS)
+                self._new_report_event.set()
     
     async def on_command_error(self, ctx, error):
         """Handle command errors"""
+        if ctx.command and ctx.command.has_error_handler():
+            return  # Already handled by the command's own error handler
+        
         if isinstance(error, commands.CommandNotFound):
-            logger.warning(f"Command not found: {ctx.message.content}")
+            logger.warning("Command not found: %s", ctx.message.content)
             await ctx.send(f"❌ Command not found. Use `!help` to see available commands.")
         else:
-            logger.error(f"Command error: {error}")
+            logger.error("Command error: %s", error)
             await ctx.send(f"❌ An error occurred: {error}")
 
 def main():
@@ -166,10 +245,18 @@ def main():
     logger.info("Starting Enhanced BDO Bot with AI Analysis System...")
     
     try:
+        # uvloop is not available on Windows; the default loop works everywhere
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
+        
+        Config.ensure_valid()
         bot = EnhancedBDOPatchBot()
         bot.run(Config.DISCORD_TOKEN)
     except Exception as e:
-        logger.error(f"Failed to start bot: {e}")
+        logger.error("Failed to start bot: %s", e)
         raise
 
 if __name__ == "__main__":
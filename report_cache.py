@@ -0,0 +1,77 @@
+"""Cache for AI analysis results keyed by the exact prompt sent to Gemini"""
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from database import BotDatabase
+
+logger = logging.getLogger(__name__)
+
+class PatchReportCache:
+    """In-memory LRU of AI analyses with an optional SQLite backend"""
+    
+    # Log the hit rate every N lookups
+    STATS_LOG_INTERVAL = 20
+    
+    def __init__(self, max_entries: int = 128, db: Optional[BotDatabase] = None):
+        self.max_entries = max_entries
+        self.db = db  # Persistent backend; shares the bot's connection and lock
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        # Hits per in-memory entry, written to the backend when the entry is evicted
+        self._hits: Dict[str, int] = {}
+        self.stats = {'hits': 0, 'misses': 0}
+    
+    @staticmethod
+    def make_key(prompt: str) -> str:
+        """Build the cache key for a prompt"""
+        return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+    
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached analysis for a key, or None on a miss"""
+        evicted = []
+        report = self._entries.get(key)
+        if report is not None:
+            self._entries.move_to_end(key)
+        elif self.db:
+            report = await asyncio.to_thread(self.db.get_cached_analysis, key)
+            if report is not None:
+                evicted = self._remember(key, report)
+        
+        if report is not None:
+            self._hits[key] = self._hits.get(key, 0) + 1
+        self._record_lookup(report is not None)
+        await self._flush_hits(evicted)
+        return report
+    
+    async def put(self, key: str, report: str):
+        """Store an analysis in memory and in the persistent backend"""
+        evicted = self._remember(key, report)
+        if self.db:
+            await asyncio.to_thread(self.db.store_cached_analysis, key, report)
+        await self._flush_hits(evicted)
+    
+    def _remember(self, key: str, report: str) -> List[Tuple[str, int]]:
+        """Insert into the in-memory LRU, evicting the oldest entry; returns (key, hits) of evicted entries"""
+        self._entries[key] = report
+        self._entries.move_to_end(key)
+        evicted = []
+        while len(self._entries) > self.max_entries:
+            old_key, _ = self._entries.popitem(last=False)
+            hits = self._hits.pop(old_key, 0)
+            if hits:
+                evicted.append((old_key, hits))
+        return evicted
+    
+    async def _flush_hits(self, evicted: List[Tuple[str, int]]):
+        """Persist the hit counts of evicted entries in one write"""
+        if evicted and self.db:
+            await asyncio.to_thread(self.db.add_cached_analysis_hits, evicted)
+    
+    def _record_lookup(self, hit: bool):
+        """Update hit/miss counters and periodically log the hit rate"""
+        self.stats['hits' if hit else 'misses'] += 1
+        total = self.stats['hits'] + self.stats['misses']
+        if total % self.STATS_LOG_INTERVAL == 0:
+            hit_rate = self.stats['hits'] / total * 100
+            logger.info(f"Report cache hit rate: {hit_rate:.1f}% ({self.stats['hits']}/{total})")
@@ -0,0 +1,21 @@
+"""Tests for BotDatabase"""
+from database import BotDatabase
+
+
+def _patch(patch_id):
+    return {'id': patch_id, 'title': f'Patch {patch_id}', 'date': '2025-08-06', 'link': 'https://example.com'}
+
+
+def test_store_ai_reports_bulk_counts_only_new_rows(tmp_path):
+    db = BotDatabase(str(tmp_path / 'bot.db'))
+    try:
+        assert db.store_ai_reports_bulk([(_patch('a'), 'a.txt')], 'Global Labs') == 1
+
+        # One duplicate and one new row; the count trigger must not inflate the result
+        inserted = db.store_ai_reports_bulk([(_patch('a'), 'a.txt'), (_patch('b'), 'b.txt')], 'Global Labs')
+
+        assert inserted == 1
+        assert db.count_reports('Global Labs') == 2
+        assert db.store_ai_reports_bulk([(_patch('a'), 'a.txt'), (_patch('b'), 'b.txt')], 'Global Labs') == 0
+    finally:
+        db.close()
@@ -0,0 +1,28 @@
+"""Tests for discord_handler's formatting helpers"""
+import pytest
+
+pytest.importorskip("discord")
+
+from discord_handler import _EMBED_FIELDS_BUDGET, _FIELDS_PER_EMBED, _chunk_report_fields, _format_effect_date
+
+
+@pytest.mark.parametrize("original, expected", [
+    ("2025.08.06", "Aug 6, 2025 (UTC)"),
+    ("2025.8.6 10:00", "Aug 6, 2025 (UTC)"),
+    ("2025.08.06. 10:00", "Aug 6, 2025 (UTC)"),
+    ("Aug 6, 2025 10:00 UTC", "Aug 6, 2025 10:00 UTC"),
+    ("not.a.date.at.all", "not.a.date.at.all (UTC)"),
+])
+def test_format_effect_date(original, expected):
+    assert _format_effect_date(original) == expected
+
+
+def test_chunk_report_fields_respects_count_and_length():
+    short = [('Global Labs', f'name {i}', 'value') for i in range(30)]
+    assert [len(batch) for batch in _chunk_report_fields(short)] == [_FIELDS_PER_EMBED, 5]
+    
+    long = [('Korean Notice', 'n' * 100, 'v' * 1024) for _ in range(12)]
+    batches = list(_chunk_report_fields(long))
+    assert sum(len(batch) for batch in batches) == 12
+    for batch in batches:
+        assert sum(len(name) + len(value) for _, name, value in batch) <= _EMBED_FIELDS_BUDGET
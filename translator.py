@@ -1,29 +1,223 @@
 """AI translation and summarization using Gemini"""
+import asyncio
+import hashlib
+import json
 import logging
-from typing import Optional, Dict, Any
+import re
+import string
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+_LANGUAGE_NAMES = {
+    'en': 'English',
+    'ko': 'Korean',
+    'es': 'Spanish',
+    'fr': 'French',
+    'de': 'German',
+    'ja': 'Japanese'
+}
+
+# Prompt templates, parsed once at import instead of rebuilt as f-strings per call
+_COMBINED_TMPL = string.Template("""
+            You are a professional translator specializing in video game content translation.
+            
+            Translate the following Black Desert Online patch notes to $language:
+            - Maintain original formatting and structure
+            - Keep technical terms and game-specific terminology accurate
+            - Preserve any numerical values, percentages, and statistics
+            - Maintain bullet points and lists if present
+            
+            Then summarize the translation in $language, focusing on the changes that affect players, formatted as:
+            **🔥 Key Changes:**
+            • [Most important changes as bullet points]
+            
+            **⚔️ Class Updates:**
+            • [Class-specific changes, or "None" if no class updates]
+            
+            **🆕 New Content:**
+            • [New features, content, or systems, or "None" if no new content]
+            
+            **🔧 Bug Fixes:**
+            • [Major bug fixes only, or "None" if no significant fixes]
+            
+            Keep the summary under 800 characters total.
+            
+            Title: $title
+            Content: $content
+            
+            Return strictly as JSON with keys "translation" and "summary".
+            """)
+
+_TRANSLATE_KO_TMPL = string.Template("""
+            You are a professional translator specializing in Korean to English translation for video game content.
+            
+            Translate the following Korean Black Desert Online patch notes to English:
+            - Maintain original formatting and structure
+            - Keep technical terms and game-specific terminology accurate
+            - Preserve any numerical values, percentages, and statistics
+            - Maintain bullet points and lists if present
+            
+            Title: $title
+            Content: $content
+            
+            Provide only the translation without additional commentary.
+            """)
+
+_TRANSLATE_TMPL = string.Template("""
+            You are a professional translator specializing in video game content translation.
+            
+            Translate the following Black Desert Online patch notes to $language:
+            - Maintain original formatting and structure
+            - Keep technical terms and game-specific terminology accurate
+            - Preserve any numerical values, percentages, and statistics
+            
+            Title: $title
+            Content: $content
+            
+            Provide only the translation without additional commentary.
+            """)
+
+_SUMMARY_TMPL = string.Template("""
+            Create a concise and informative summary of these Black Desert Online patch notes.
+            Focus on the most important changes that affect players.
+            
+            Format your response as follows:
+            **🔥 Key Changes:**
+            • [Most important changes as bullet points]
+            
+            **⚔️ Class Updates:**
+            • [Class-specific changes, or "None" if no class updates]
+            
+            **🆕 New Content:**
+            • [New features, content, or systems, or "None" if no new content]
+            
+            **🔧 Bug Fixes:**
+            • [Major bug fixes only, or "None" if no significant fixes]
+            
+            Content to summarize:
+            $content
+            
+            Keep the summary under 800 characters total.
+            """)
+
+_SUMMARY_MAINT_TMPL = string.Template("""
+                Create a brief summary of this Black Desert maintenance notice.
+                Focus on key information players need to know.
+                
+                Format:
+                **🔧 Maintenance Details:**
+                • [Key points about the maintenance]
+                
+                **⏰ Timing:**
+                • [When and how long]
+                
+                **📋 Impact:**
+                • [What services affected]
+                
+                Content: $content
+                """)
+
+_SUMMARY_PATCH_TMPL = string.Template("""
+                Create a structured summary of these Black Desert patch notes:
+                
+                **🔥 Key Changes:**
+                • [Most important updates]
+                
+                **⚔️ Class Updates:**
+                • [Class changes or "None"]
+                
+                **🆕 New Content:**
+                • [New features or "None"]
+                
+                **🔧 Bug Fixes:**
+                • [Major fixes or "None"]
+                
+                Content: $content
+                """)
+
+_SIMPLE_TMPL = string.Template("""
+            Translate this Korean text to English, maintaining any formatting:
+            $text
+            
+            Provide only the translation.
+            """)
+
+# Keywords that mark a maintenance notice; substring matches, so "servers" counts too
+_MAINT_RE = re.compile(r'maintenance|scheduled|server|unavailable', re.IGNORECASE)
+
+# Gemini sometimes wraps JSON answers in a markdown code fence
+_JSON_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$')
+
+def _parse_translation_json(text: str) -> Optional[Tuple[str, str]]:
+    """Return (translation, summary) from a combined JSON answer, or None if it is malformed"""
+    try:
+        data = json.loads(_JSON_FENCE_RE.sub('', text))
+    except ValueError:
+        return None
+    
+    if not isinstance(data, dict):
+        return None
+    translation, summary = data.get('translation'), data.get('summary')
+    if not (isinstance(translation, str) and isinstance(summary, str) and translation and summary):
+        return None
+    return translation, summary
+
 class BDOTranslator:
     """Handles AI translation and summarization of patch notes"""
     
     def __init__(self):
         self.model = Config.initialize_gemini()
+        
+        # (translation, summary) results by content hash, so re-runs skip Gemini
+        self._cache: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+        
+        # translate_simple_text results by input text; repeated notice headers are common
+        self._simple_cache: "OrderedDict[str, str]" = OrderedDict()
+    
+    @staticmethod
+    def _cache_key(kind: str, patch: Dict[str, Any]) -> str:
+        """Hash of everything the prompt depends on; kind separates modes and target languages"""
+        text = f"{kind}\0{patch['title']}\0{patch['content']}"
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    def _cache_get(self, key: str) -> Optional[Tuple[str, str]]:
+        """Return a cached (translation, summary) pair, or None on a miss"""
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+        return result
+    
+    def _cache_put(self, key: str, translated: str, summary: str):
+        """Remember a result, evicting the least recently used entry"""
+        self._cache[key] = (translated, summary)
+        self._cache.move_to_end(key)
+        while len(self._cache) > Config.TRANSLATION_CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
     
     async def translate_and_summarize(self, korean_patch: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Translate Korean patch notes and create summary using Gemini"""
         try:
-            # Step 1: Translate Korean to English
-            translated_content = await self._translate_content(korean_patch)
-            if not translated_content:
-                return None
-            
-            # Step 2: Create AI summary
-            ai_summary = await self._create_summary(translated_content)
+            # One round trip for both; fall back to separate calls if the JSON is unusable
+            cache_key = self._cache_key('en', korean_patch)
+            content = korean_patch['content'][:Config.MAX_TRANSLATION_LENGTH]  # Truncated once for every prompt below
+            combined = self._cache_get(cache_key) or await self._translate_and_summarize_once(korean_patch, content)
+            if combined:
+                translated_content, ai_summary = combined
+            else:
+                # Step 1: Translate Korean to English
+                translated_content = await self._translate_content(korean_patch, content)
+                if not translated_content:
+                    return None
+                
+                # Step 2: Create AI summary
+                ai_summary = await self._create_summary(translated_content)
             if not ai_summary:
                 return None
             
+            self._cache_put(cache_key, translated_content, ai_summary)
             return {
                 'original': korean_patch,
                 'translated': translated_content,
@@ -31,7 +225,7 @@ class BDOTranslator:
             }
             
         except Exception as e:
-            logger.error(f"Translation/Summary error: {e}")
+            logger.error("Translation/Summary error: %s", e)
             return None
     
     async def translate_and_summarize_with_language(self, patch: Dict[str, Any], target_language: str) -> Optional[Dict[str, Any]]:
@@ -42,20 +236,42 @@ class BDOTranslator:
             (patch.get('language') == 'korean' and target_language == 'ko'):
                 
                 # Generate summary for existing content
-                summary = await self._create_summary_in_language(patch['content'], target_language)
+                cache_key = self._cache_key(f"summary:{target_language}", patch)
+                cached = self._cache_get(cache_key)
+                if cached:
+                    summary = cached[1]
+                else:
+                    summary = await self._create_summary_in_language(patch['content'], target_language)
+                    if summary:
+                        self._cache_put(cache_key, patch['content'], summary)
                 
                 enhanced_patch = patch.copy()
                 enhanced_patch['summary'] = summary
                 return enhanced_patch
             
-            # Need translation
-            translated_content = await self._translate_to_language(patch, target_language)
-            if not translated_content:
-                return None
-            
-            # Create summary in target language
-            summary = await self._create_summary_in_language(translated_content, target_language)
+            # Need translation; ask for translation and summary in one round trip
+            cache_key = self._cache_key(f"translate:{target_language}", patch)
+            content = patch['content'][:Config.MAX_TRANSLATION_LENGTH]  # Truncated once for every prompt below
+            cached = self._cache_get(cache_key)
+            combined = None if cached else await self._translate_and_summarize_once(patch, content, target_language)
+            if cached:
+                translated_content, summary = cached
+            elif combined:
+                translated_content, summary = combined
+                if _MAINT_RE.search(translated_content):
+                    # The combined prompt only knows the patch-notes format; maintenance notices keep
+                    # their own template and 1000-char cap
+                    summary = await self._create_summary_in_language(translated_content, target_language)
+            else:
+                translated_content = await self._translate_to_language(patch, content, target_language)
+                if not translated_content:
+                    return None
+                
+                # Create summary in target language
+                summary = await self._create_summary_in_language(translated_content, target_language)
             
+            if summary:
+                self._cache_put(cache_key, translated_content, summary)
             return {
                 'original': patch,
                 'translated': translated_content,
@@ -69,70 +285,51 @@ class BDOTranslator:
             }
             
         except Exception as e:
-            logger.error(f"Enhanced translation error: {e}")
+            logger.error("Enhanced translation error: %s", e)
             return None
 
-    async def _translate_content(self, korean_patch: Dict[str, Any]) -> Optional[str]:
-        """Translate Korean content to English"""
+    async def _translate_and_summarize_once(self, patch: Dict[str, Any], content: str,
+                                            target_language: str = 'en') -> Optional[Tuple[str, str]]:
+        """Translate and summarize with a single Gemini call; None if the answer can't be parsed"""
         try:
-            content_to_translate = korean_patch['content'][:Config.MAX_TRANSLATION_LENGTH]
-            
-            translation_prompt = f"""
-            You are a professional translator specializing in Korean to English translation for video game content.
+            target_lang_name = _LANGUAGE_NAMES.get(target_language, 'English')
             
-            Translate the following Korean Black Desert Online patch notes to English:
-            - Maintain original formatting and structure
-            - Keep technical terms and game-specific terminology accurate
-            - Preserve any numerical values, percentages, and statistics
-            - Maintain bullet points and lists if present
+            prompt = _COMBINED_TMPL.substitute(language=target_lang_name, title=patch['title'], content=content)
             
-            Title: {korean_patch['title']}
-            Content: {content_to_translate}
+            response = await asyncio.to_thread(self.model.generate_content, prompt)
+            combined = _parse_translation_json(response.text)
+            if combined is None:
+                logger.warning("Combined translation response was not valid JSON; using separate calls")
+            return combined
             
-            Provide only the translation without additional commentary.
-            """
+        except Exception as e:
+            logger.error("Combined translation error: %s", e)
+            return None
+    
+    async def _translate_content(self, korean_patch: Dict[str, Any], content_to_translate: str) -> Optional[str]:
+        """Translate Korean content (already truncated) to English"""
+        try:
+            translation_prompt = _TRANSLATE_KO_TMPL.substitute(title=korean_patch['title'], content=content_to_translate)
             
-            response = self.model.generate_content(translation_prompt)
+            response = await asyncio.to_thread(self.model.generate_content, translation_prompt)
             return response.text
             
         except Exception as e:
-            logger.error(f"Translation error: {e}")
+            logger.error("Translation error: %s", e)
             return None
     
-    async def _translate_to_language(self, patch: Dict[str, Any], target_language: str) -> Optional[str]:
-        """Translate patch content to specific target language"""
+    async def _translate_to_language(self, patch: Dict[str, Any], content: str, target_language: str) -> Optional[str]:
+        """Translate patch content (already truncated) to specific target language"""
         try:
-            content = patch['content'][:Config.MAX_TRANSLATION_LENGTH]
-            language_names = {
-                'en': 'English',
-                'ko': 'Korean',
-                'es': 'Spanish', 
-                'fr': 'French',
-                'de': 'German',
-                'ja': 'Japanese'
-            }
+            target_lang_name = _LANGUAGE_NAMES.get(target_language, 'English')
             
-            target_lang_name = language_names.get(target_language, 'English')
+            translation_prompt = _TRANSLATE_TMPL.substitute(language=target_lang_name, title=patch['title'], content=content)
             
-            translation_prompt = f"""
-            You are a professional translator specializing in video game content translation.
-            
-            Translate the following Black Desert Online patch notes to {target_lang_name}:
-            - Maintain original formatting and structure
-            - Keep technical terms and game-specific terminology accurate
-            - Preserve any numerical values, percentages, and statistics
-            
-            Title: {patch['title']}
-            Content: {content}
-            
-            Provide only the translation without additional commentary.
-            """
-            
-            response = self.model.generate_content(translation_prompt)
+            response = await asyncio.to_thread(self.model.generate_content, translation_prompt)
             return response.text
             
         except Exception as e:
-            logger.error(f"Language translation error: {e}")
+            logger.error("Language translation error: %s", e)
             return None
     
     async def _create_summary(self, translated_content: str) -> Optional[str]:
@@ -140,101 +337,54 @@ class BDOTranslator:
         try:
             content_to_summarize = translated_content[:Config.MAX_SUMMARY_LENGTH]
             
-            summary_prompt = f"""
-            Create a concise and informative summary of these Black Desert Online patch notes.
-            Focus on the most important changes that affect players.
-            
-            Format your response as follows:
-            **🔥 Key Changes:**
-            • [Most important changes as bullet points]
-            
-            **⚔️ Class Updates:**
-            • [Class-specific changes, or "None" if no class updates]
-            
-            **🆕 New Content:**
-            • [New features, content, or systems, or "None" if no new content]
-            
-            **🔧 Bug Fixes:**
-            • [Major bug fixes only, or "None" if no significant fixes]
-            
-            Content to summarize:
-            {content_to_summarize}
+            summary_prompt = _SUMMARY_TMPL.substitute(content=content_to_summarize)
             
-            Keep the summary under 800 characters total.
-            """
-            
-            response = self.model.generate_content(summary_prompt)
+            response = await asyncio.to_thread(self.model.generate_content, summary_prompt)
             return response.text
             
         except Exception as e:
-            logger.error(f"Summary error: {e}")
+            logger.error("Summary error: %s", e)
             return None
     
     async def _create_summary_in_language(self, content: str, language: str) -> Optional[str]:
         """Enhanced summary creation with maintenance detection"""
         try:
             # Check if this is a maintenance notice
-            is_maintenance = any(keyword in content.lower() 
-                            for keyword in ['maintenance', 'scheduled', 'server', 'unavailable'])
+            is_maintenance = bool(_MAINT_RE.search(content))
             
             if is_maintenance:
                 # Special prompt for maintenance notices
-                summary_prompt = f"""
-                Create a brief summary of this Black Desert maintenance notice.
-                Focus on key information players need to know.
-                
-                Format:
-                **🔧 Maintenance Details:**
-                • [Key points about the maintenance]
-                
-                **⏰ Timing:**
-                • [When and how long]
-                
-                **📋 Impact:**
-                • [What services affected]
-                
-                Content: {content[:1000]}
-                """
+                summary_prompt = _SUMMARY_MAINT_TMPL.substitute(content=content[:1000])
             else:
                 # Regular patch content prompt
-                summary_prompt = f"""
-                Create a structured summary of these Black Desert patch notes:
-                
-                **🔥 Key Changes:**
-                • [Most important updates]
-                
-                **⚔️ Class Updates:**
-                • [Class changes or "None"]
-                
-                **🆕 New Content:**
-                • [New features or "None"]
-                
-                **🔧 Bug Fixes:**
-                • [Major fixes or "None"]
-                
-                Content: {content[:2000]}
-                """
+                summary_prompt = _SUMMARY_PATCH_TMPL.substitute(content=content[:2000])
             
-            response = self.model.generate_content(summary_prompt)
+            response = await asyncio.to_thread(self.model.generate_content, summary_prompt)
             return response.text
             
         except Exception as e:
-            logger.error(f"Summary generation error: {e}")
+            logger.error("Summary generation error: %s", e)
             return None
 
     async def translate_simple_text(self, korean_text: str) -> Optional[str]:
         """Simple translation for shorter texts"""
         try:
-            prompt = f"""
-            Translate this Korean text to English, maintaining any formatting:
-            {korean_text[:1000]}
-            
-            Provide only the translation.
-            """
-            
-            response = self.model.generate_content(prompt)
-            return response.text
+            text = korean_text[:1000]
+            cached = self._simple_cache.get(text)
+            if cached is not None:
+                self._simple_cache.move_to_end(text)
+                return cached
+            
+            prompt = _SIMPLE_TMPL.substitute(text=text)
+            
+            response = await asyncio.to_thread(self.model.generate_content, prompt)
+            translation = response.text
+            if translation:
+                self._simple_cache[text] = translation
+                while len(self._simple_cache) > Config.TRANSLATION_CACHE_MAX_ENTRIES:
+                    self._simple_cache.popitem(last=False)
+            return translation
             
         except Exception as e:
-            logger.error(f"Simple translation error: {e}")
+            logger.error("Simple translation error: %s", e)
             return None
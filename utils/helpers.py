@@ -1,8 +1,29 @@
 """Utility functions and logging setup with UTF-8 support"""
+import asyncio
+import atexit
+import codecs
 import logging
+import logging.handlers
+import queue
 import sys
 import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import Optional
+
+# Writes queued log records to the console and file handlers on its own thread
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+def _stop_log_listener():
+    """Flush queued records and stop the logging thread"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+atexit.register(_stop_log_listener)
 
 def setup_logging():
     """Set up logging with UTF-8 support for Korean characters"""
@@ -38,17 +59,31 @@ def setup_logging():
     console_handler.setFormatter(formatter)
     console_handler.setLevel(logging.INFO)
     
-    # Add handler to logger
-    logger.addHandler(console_handler)
-    
     # Also create a file handler for persistent logs
     file_handler = logging.FileHandler('bot.log', encoding='utf-8')
     file_handler.setFormatter(formatter)
     file_handler.setLevel(logging.INFO)
-    logger.addHandler(file_handler)
+    
+    # The root logger only enqueues records so file and console I/O never blocks the event loop.
+    # QueueHandler still merges each message with its arguments on the logging thread; the
+    # handlers' formatting and the writes happen on the listener thread
+    global _log_listener
+    _stop_log_listener()
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _log_listener.start()
     
     logger.info("Logging configured with UTF-8 support for Korean characters")
 
+def _codepoint_placeholder(exc: UnicodeEncodeError):
+    """Encode error handler replacing each unencodable character with [U+XXXX]"""
+    return ''.join(f'[U+{ord(char):04X}]' for char in exc.object[exc.start:exc.end]), exc.end
+
+codecs.register_error('codepoint_placeholder', _codepoint_placeholder)
+
 def safe_log_message(message: str) -> str:
     """Create a safe log message that won't cause encoding errors"""
     try:
@@ -56,13 +91,83 @@ def safe_log_message(message: str) -> str:
         message.encode('ascii')
         return message
     except UnicodeEncodeError:
-        # If it contains Unicode, create a safe version
-        safe_chars = []
-        for char in message:
-            try:
-                char.encode('ascii')
-                safe_chars.append(char)
-            except UnicodeEncodeError:
-                # Replace Unicode characters with a placeholder
-                safe_chars.append(f'[U+{ord(char):04X}]')
-        return ''.join(safe_chars)
+        # If it contains Unicode, replace each such character in one C-level pass
+        return message.encode('ascii', 'codepoint_placeholder').decode('ascii')
+
+class TTLCache:
+    """Small LRU cache whose entries expire after ttl seconds"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+    
+    def get(self, key, default=None):
+        """Return the cached value, or default if missing or expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        if entry[0] <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return entry[1]
+    
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entry when full"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def discard_where(self, predicate):
+        """Drop every entry whose key matches predicate"""
+        for key in [k for k in self._data if predicate(k)]:
+            del self._data[key]
+
+class RateLimiter:
+    """Sliding-window send limiter: one global budget plus a smaller budget per key"""
+    
+    def __init__(self, key_calls: int, key_period: float, global_calls: int, global_period: float):
+        self.key_calls = key_calls
+        self.key_period = key_period
+        self.global_calls = global_calls
+        self.global_period = global_period
+        self._global = deque()  # timestamps of recent calls
+        self._per_key = {}  # key -> deque of timestamps
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    @asynccontextmanager
+    async def acquire(self, key):
+        """Wait until both the key's bucket and the global bucket have room"""
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                bucket = self._per_key.setdefault(key, deque())
+                self._expire(self._global, now - self.global_period)
+                self._expire(bucket, now - self.key_period)
+                
+                wait = self._blocked_until - now
+                if len(self._global) >= self.global_calls:
+                    wait = max(wait, self._global[0] + self.global_period - now)
+                if len(bucket) >= self.key_calls:
+                    wait = max(wait, bucket[0] + self.key_period - now)
+                
+                if wait <= 0:
+                    self._global.append(now)
+                    bucket.append(now)
+                    break
+            # Sleep outside the lock so other keys are not held up
+            await asyncio.sleep(wait)
+        yield
+    
+    def penalize(self, retry_after: float):
+        """Hold every caller back for retry_after seconds, e.g. after a 429"""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+    
+    @staticmethod
+    def _expire(timestamps: deque, cutoff: float):
+        """Drop timestamps older than cutoff"""
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()